@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+def text_hash(resume_text):
+    return hashlib.sha256(resume_text.encode('utf-8')).hexdigest()
+
+
+def make_cache_key(resume_text):
+    """Content-addressed key: analyses are profile-independent, so only the resume text counts"""
+    return cache_key_for_hash(text_hash(resume_text))
+
+
+def cache_key_for_hash(resume_hash):
+    # The empty profile fields keep keys written by earlier versions (and the disk tier) valid
+    return f"{resume_hash}::"
+
+
+class AnalysisCache:
+    """Two-tier analysis cache: an in-memory LRU with TTL and an optional on-disk tier"""
+
+    def __init__(self, max_entries=256, ttl_seconds=24 * 3600, disk_dir=None):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.disk_dir = disk_dir
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    def _disk_path(self, key):
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.disk_dir, f"{digest}.json")
+
+    def _expired(self, stored_at):
+        return self.ttl_seconds is not None and time.time() - stored_at > self.ttl_seconds
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if not self._expired(stored_at):
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                del self._entries[key]
+
+        record = self._read_disk(key)
+        with self._lock:
+            if record is None:
+                self._stats["misses"] += 1
+                return None
+            self._stats["hits"] += 1
+            self._stats["disk_hits"] += 1
+            # Keep the original store time, so promotion never extends an entry's TTL
+            stored_at, value = record
+            self._insert(key, value, stored_at)
+        return value
+
+    def set(self, key, value):
+        stored_at = time.time()
+        with self._lock:
+            self._insert(key, value, stored_at)
+            self._stats["stores"] += 1
+        self._write_disk(key, value, stored_at)
+
+    def _insert(self, key, value, stored_at):
+        self._entries[key] = (stored_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def _read_disk(self, key):
+        """(stored_at, value) from the disk tier, or None if missing or expired"""
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                record = json.load(file)
+        except (OSError, ValueError):
+            return None
+        stored_at = record.get("stored_at", 0)
+        if record.get("key") != key or self._expired(stored_at):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return stored_at, record.get("value")
+
+    def _write_disk(self, key, value, stored_at):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as file:
+                json.dump({"key": key, "stored_at": stored_at, "value": value}, file)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError, ValueError) as e:
+            print(f"Error writing analysis cache entry: {e}")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["max_entries"] = self.max_entries
+        stats["ttl_seconds"] = self.ttl_seconds
+        stats["disk_enabled"] = bool(self.disk_dir)
+        return stats
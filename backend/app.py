@@ -1,39 +1,207 @@
-from flask import Flask, request, jsonify
+from flask import Blueprint, Flask, Request, request, jsonify, Response, g, stream_with_context
 from flask_cors import CORS
 import os
+import importlib.metadata
+import io
+import functools
 import json
+import tempfile
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from werkzeug.utils import secure_filename
-import PyPDF2
-import docx
-import google.generativeai as genai
 import re
+import threading
 import time
+from collections import OrderedDict
 from dotenv import load_dotenv
+from analysis_cache import AnalysisCache, cache_key_for_hash, make_cache_key, text_hash
+from candidate_index import CandidateIndex
+from fast_analyzer import FastAnalyzer, extract_contact_info
+from gemini_scheduler import BATCH, INTERACTIVE, GeminiScheduler, is_rate_limit_error
+from json_stream import TopLevelFieldParser, parse_json_lenient
+from job_queue import InMemoryJobStore, JobQueue, QueueFullError, SQLiteJobStore
+from keyword_matcher import KeywordMatcher, normalize_term, resume_ngrams
+from metrics import Metrics, server_timing
+from near_duplicates import NearDuplicateIndex
+from pdf_extractor import PdfExtractor
+from profile_ranker import ProfileRanker, profile_term_weights
+from profile_store import ProfileStore
+from response_models import ANALYSIS_SCHEMA, JOB_PROFILE_SCHEMA, GeneratedProfile, ResumeAnalysis
+from prompt_slimmer import slim_resume_text
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-CORS(app)
+# Uploads stay in memory up to this size, then spill to an anonymous temp file
+UPLOAD_SPOOL_THRESHOLD = int(os.getenv('UPLOAD_SPOOL_THRESHOLD', str(2 * 1024 * 1024)))
+
+class SpooledUploadRequest(Request):
+    """Request whose uploaded files are spooled in memory instead of going through uploads/"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return tempfile.SpooledTemporaryFile(max_size=UPLOAD_SPOOL_THRESHOLD)
+
+# Routes live on this blueprint; create_app() builds the Flask app around it
+api = Blueprint('api', __name__)
+
+# Per-stage latency histograms and counters, served at /api/metrics. With timing headers
+# enabled, every response also carries its stage durations in a Server-Timing header
+METRICS_TIMING_HEADERS = os.getenv('METRICS_TIMING_HEADERS', '0') == '1'
+metrics = Metrics()
+metrics.describe("stage_seconds", "Seconds spent in each stage of handling a request")
+metrics.describe("http_request_seconds", "Seconds spent handling each endpoint")
+metrics.describe("http_requests_total", "Requests handled, by endpoint and status")
+metrics.describe("gemini_calls_total", "Gemini call outcomes seen by the scheduler (retries, rate_limited, errors, completed)")
+metrics.describe("prompt_tokens_saved_total", "Estimated resume tokens removed by prompt slimming")
+metrics.describe("json_parse_failures_total", "Gemini responses that were not valid JSON")
+metrics.describe("fallback_analyses_total", "Analyses served by the local fast-mode fallback, by reason")
+metrics.describe("json_repairs_total", "Truncated or malformed Gemini responses recovered by JSON repair")
+metrics.describe("repeat_analyses_total", "Gemini analyses of a resume whose previous analysis fell back, by that fallback's reason")
 
 # Configuration
-UPLOAD_FOLDER = 'uploads'
 ALLOWED_EXTENSIONS = {'txt', 'pdf', 'doc', 'docx'}
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
+
+# Batch analysis: extraction runs in a process pool, Gemini calls are bounded
+BATCH_EXTRACT_WORKERS = int(os.getenv('BATCH_EXTRACT_WORKERS', str(os.cpu_count() or 2)))
+BATCH_MAX_IN_FLIGHT = int(os.getenv('BATCH_MAX_IN_FLIGHT', '4'))
+BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', '500'))
+# Total size of the files in one batch once zip archives are expanded
+BATCH_MAX_BYTES = int(os.getenv('BATCH_MAX_BYTES', str(256 * 1024 * 1024)))
 
-# Create upload directory if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+# Asynchronous analysis jobs; JOB_STORE_PATH switches the job store to SQLite. Workers of a
+# multi-process server each have their own memory, so a job could only be polled on the worker
+# that accepted it: with WEB_CONCURRENCY above 1 the store defaults to a shared jobs.db
+JOB_WORKERS = int(os.getenv('JOB_WORKERS', '4'))
+JOB_QUEUE_SIZE = int(os.getenv('JOB_QUEUE_SIZE', '100'))
+JOB_RETENTION = int(os.getenv('JOB_RETENTION', '3600'))
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '1'))
+JOB_STORE_PATH = os.getenv('JOB_STORE_PATH') or ('jobs.db' if WEB_CONCURRENCY > 1 else None)
 
-# Configure Gemini API
+# Searchable index of analyzed candidates (memory-mapped segments on disk)
+CANDIDATE_INDEX_DIR = os.getenv('CANDIDATE_INDEX_DIR', 'candidate_index')
+CANDIDATE_INDEX_COMPACT_EVERY = int(os.getenv('CANDIDATE_INDEX_COMPACT_EVERY', '500'))
+
+# Gemini API
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
-genai.configure(api_key=GEMINI_API_KEY)
 
-# Initialize Gemini model
-model = genai.GenerativeModel('gemini-1.5-flash')
+# Import the model SDK, parsers and Gemini client in a background thread as soon as the app is
+# created, so the first analysis does not pay for them (0 loads each on first use instead)
+APP_WARM_UP = os.getenv('APP_WARM_UP', '1') == '1'
+
+def create_model():
+    """Gemini client. Importing google.generativeai (grpc, protobuf) takes most of a second, so
+    the scheduler calls this on first use, in each worker process rather than before forking"""
+    import google.generativeai as genai
+    genai.configure(api_key=GEMINI_API_KEY)
+    return genai.GenerativeModel('gemini-1.5-flash')
+
+def supports_structured_output():
+    """google-generativeai added response_schema in 0.7; older SDKs reject it. Read from the
+    package metadata so the SDK itself is not imported"""
+    try:
+        version = importlib.metadata.version('google-generativeai')
+    except importlib.metadata.PackageNotFoundError:
+        return False
+    return tuple(int(part) for part in re.findall(r'\d+', version)[:2]) >= (0, 7)
+
+# Responses are constrained to a JSON schema, so prompts can leave out the JSON template
+# (GEMINI_STRUCTURED_OUTPUT=0 falls back to asking for JSON in the prompt)
+GEMINI_STRUCTURED_OUTPUT = os.getenv('GEMINI_STRUCTURED_OUTPUT', '1') == '1'
+if GEMINI_STRUCTURED_OUTPUT and not supports_structured_output():
+    print("Installed google-generativeai does not support response_schema; asking for JSON in the prompt instead")
+    GEMINI_STRUCTURED_OUTPUT = False
+
+def output_options(schema):
+    """generate_content kwargs constraining the response to schema, when structured output is on"""
+    if not GEMINI_STRUCTURED_OUTPUT:
+        return {}
+    return {"generation_config": {"response_mime_type": "application/json", "response_schema": schema}}
+
+ANALYSIS_OUTPUT = output_options(ANALYSIS_SCHEMA)
+JOB_PROFILE_OUTPUT = output_options(JOB_PROFILE_SCHEMA)
+
+# Token budget for the resume text sent to Gemini (0 sends everything left after slimming)
+PROMPT_TOKEN_BUDGET = int(os.getenv('PROMPT_TOKEN_BUDGET', '6000'))
+
+# PDF extraction: long documents are split into page ranges on a process pool. PDF_TIME_BUDGET
+# is seconds per document (0 disables it); extraction also stops once it has about twice the
+# prompt budget in text, since slimming drops boilerplate before the prompt is built
+PDF_EXTRACT_WORKERS = int(os.getenv('PDF_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 2))))
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '40'))
+PDF_TIME_BUDGET = float(os.getenv('PDF_TIME_BUDGET', '8'))
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+
+pdf_extractor = PdfExtractor(
+    max_workers=PDF_EXTRACT_WORKERS,
+    max_pages=PDF_MAX_PAGES,
+    time_budget=PDF_TIME_BUDGET,
+    token_target=PROMPT_TOKEN_BUDGET * 2 or None,
+    parallel_min_pages=PDF_PARALLEL_MIN_PAGES
+)
+
+# Every model call goes through one scheduler (0 disables a budget)
+GEMINI_RPM = int(os.getenv('GEMINI_RPM', '60'))
+GEMINI_TPM = int(os.getenv('GEMINI_TPM', '1000000'))
+GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '4'))
+GEMINI_MAX_RETRIES = int(os.getenv('GEMINI_MAX_RETRIES', '3'))
+gemini_scheduler = GeminiScheduler(
+    model_factory=create_model,
+    requests_per_minute=GEMINI_RPM or None,
+    tokens_per_minute=GEMINI_TPM or None,
+    max_concurrency=GEMINI_MAX_CONCURRENCY,
+    max_retries=GEMINI_MAX_RETRIES,
+    metrics=metrics
+)
+
+# Analysis cache: in-memory LRU, plus an on-disk tier when ANALYSIS_CACHE_DIR is set
+ANALYSIS_CACHE_SIZE = int(os.getenv('ANALYSIS_CACHE_SIZE', '256'))
+ANALYSIS_CACHE_TTL = int(os.getenv('ANALYSIS_CACHE_TTL', str(24 * 3600)))
+ANALYSIS_CACHE_DIR = os.getenv('ANALYSIS_CACHE_DIR') or None
+analysis_cache = AnalysisCache(
+    max_entries=ANALYSIS_CACHE_SIZE,
+    ttl_seconds=ANALYSIS_CACHE_TTL,
+    disk_dir=ANALYSIS_CACHE_DIR
+)
+
+# MinHash/LSH index of analyzed resumes; a resubmission at or above the threshold reuses the
+# cached analysis of its near-duplicate (0 disables). Persisted alongside the disk cache tier
+NEAR_DUPLICATE_THRESHOLD = float(os.getenv('NEAR_DUPLICATE_THRESHOLD', '0.8'))
 
-# Job profiles data
-JOB_PROFILES = {
+# The near-duplicate index, job queue and candidate index read or create files when built, so
+# they are created on first use: importing app.py has no side effects, and each forked worker
+# opens its own
+_stores = {}
+_stores_lock = threading.RLock()
+
+def _store(name, factory):
+    with _stores_lock:
+        if name not in _stores:
+            _stores[name] = factory()
+        return _stores[name]
+
+def get_near_duplicates():
+    """The near-duplicate index, or None when NEAR_DUPLICATE_THRESHOLD is 0"""
+    return _store('near_duplicates', lambda: NearDuplicateIndex(
+        threshold=NEAR_DUPLICATE_THRESHOLD,
+        path=os.path.join(ANALYSIS_CACHE_DIR, 'minhash.bin') if ANALYSIS_CACHE_DIR else None
+    ) if NEAR_DUPLICATE_THRESHOLD > 0 else None)
+
+def create_job_store():
+    if JOB_STORE_PATH:
+        return SQLiteJobStore(JOB_STORE_PATH, retention_seconds=JOB_RETENTION)
+    return InMemoryJobStore(retention_seconds=JOB_RETENTION)
+
+def get_job_queue():
+    return _store('job_queue', lambda: JobQueue(create_job_store(), workers=JOB_WORKERS, max_pending=JOB_QUEUE_SIZE))
+
+def get_candidate_index():
+    return _store('candidate_index', lambda: CandidateIndex(
+        CANDIDATE_INDEX_DIR, compact_every=CANDIDATE_INDEX_COMPACT_EVERY
+    ))
+
+# Built-in job profiles; custom ones live in the profile store
+DEFAULT_JOB_PROFILES = {
     "software_engineer": {
         "name": "Software Engineer",
         "required_skills": ["python", "java", "javascript", "react", "node.js", "sql", "git", "api", "database", "web development"],
@@ -57,363 +225,561 @@ JOB_PROFILES = {
     }
 }
 
+# Local keyword matching engine behind match_score / match_details
+keyword_matcher = KeywordMatcher(DEFAULT_JOB_PROFILES)
+
+# Sparse profile-by-term matrix for ranking a resume against every profile at once
+profile_ranker = ProfileRanker(DEFAULT_JOB_PROFILES)
+
+# Local analysis for mode=fast and for the degraded path when Gemini fails
+ANALYSIS_MODES = ('full', 'fast')
+FAST_MODE_SPACY_MODEL = os.getenv('FAST_MODE_SPACY_MODEL', 'en_core_web_sm')
+FAST_MODE_PROCESSES = int(os.getenv('FAST_MODE_PROCESSES', '1'))
+fast_analyzer = FastAnalyzer(DEFAULT_JOB_PROFILES, model_name=FAST_MODE_SPACY_MODEL, n_process=FAST_MODE_PROCESSES)
+
+# Job profile store: copy-on-write snapshots, single-flight generation, and SQLite persistence
+# at JOB_PROFILE_STORE_PATH (empty keeps custom profiles in memory only)
+JOB_PROFILE_STORE_PATH = os.getenv('JOB_PROFILE_STORE_PATH', 'job_profiles.db') or None
+profile_store = ProfileStore(DEFAULT_JOB_PROFILES, path=JOB_PROFILE_STORE_PATH)
+
+def sync_profile_engines(key, profile):
+    """Keep the local matching engines in step with the profile store"""
+    for engine in (keyword_matcher, profile_ranker, fast_analyzer):
+        if profile is None:
+            engine.remove_profile(key)
+        else:
+            engine.set_profile(key, profile)
+
+def job_profiles():
+    """Read-only snapshot of every job profile; never blocks on writers"""
+    return profile_store.snapshot()
+
+profile_store.subscribe(sync_profile_engines)
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def extract_text_from_pdf(file_path):
-    text = ""
+def upload_error(filename, mode):
+    """Validation error for an analyze-resume upload, or None"""
+    if filename == '':
+        return "No file selected"
+    if mode not in ANALYSIS_MODES:
+        return "mode must be 'full' or 'fast'"
+    if not allowed_file(filename):
+        return "File type not supported. Please upload PDF, DOC, DOCX, or TXT files"
+    return None
+
+def extract_pdf(stream):
+    """PDF text (form feeds mark page breaks) plus page timings and why extraction stopped"""
     try:
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            for page in pdf_reader.pages:
-                text += page.extract_text()
+        return pdf_extractor.extract(stream.read())
     except Exception as e:
         print(f"Error reading PDF: {e}")
-    return text
+        return "", {}
+
+def extract_text_from_pdf(stream):
+    return extract_pdf(stream)[0]
 
-def extract_text_from_docx(file_path):
+def extract_text_from_docx(stream):
     text = ""
     try:
-        doc = docx.Document(file_path)
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
+        import docx  # python-docx is imported on first use to keep app startup fast
+        doc = docx.Document(stream)
+        text = "\n".join(paragraph.text for paragraph in doc.paragraphs)
     except Exception as e:
         print(f"Error reading DOCX: {e}")
     return text
 
-def extract_text_from_txt(file_path):
+def extract_text_from_txt(stream):
     text = ""
     try:
-        with open(file_path, 'r', encoding='utf-8') as file:
-            text = file.read()
+        text = stream.read().decode('utf-8')
     except Exception as e:
         print(f"Error reading TXT: {e}")
     return text
 
-def extract_text_from_file(file_path, filename):
+def extract_text_from_file(stream, filename):
+    """Extract text from a readable, seekable binary stream; nothing is written to disk"""
     extension = filename.rsplit('.', 1)[1].lower()
     
     if extension == 'pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(stream)
     elif extension == 'docx':
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(stream)
     elif extension == 'txt':
-        return extract_text_from_txt(file_path)
+        return extract_text_from_txt(stream)
     else:
         return ""
 
+def extract_text_with_stats(stream, filename):
+    """Like extract_text_from_file, plus extraction stats for PDFs"""
+    if filename.rsplit('.', 1)[1].lower() == 'pdf':
+        return extract_pdf(stream)
+    return extract_text_from_file(stream, filename), {}
 
-def extract_contact_info_fallback(text):
-    """Fallback contact extraction if Gemini fails"""
-    contact_info = {}
-    
-    # Email extraction
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    contact_info['emails'] = emails
-    
-    # Phone number extraction
-    phone_pattern = r'(\+\d{1,3}[-.\ s]?)?\(?\d{3}\)?[-.\ s]?\d{3}[-.\ s]?\d{4}'
-    phones = re.findall(phone_pattern, text)
-    contact_info['phones'] = [phone[0] + phone[1] if isinstance(phone, tuple) else phone for phone in phones]
-    
-    # LinkedIn profile extraction
-    linkedin_pattern = r'linkedin\.com/in/[\w-]+'
-    linkedin = re.findall(linkedin_pattern, text.lower())
-    contact_info['linkedin'] = linkedin
-    
-    return contact_info
+def extract_text_from_upload(data, filename):
+    """Extract text from raw upload bytes; safe to run in a worker process"""
+    return extract_text_from_file(io.BytesIO(data), filename)
 
 
-def analyze_resume_with_gemini(resume_text, job_profile_key=None):
-    """Use Gemini API to analyze resume comprehensively"""
-    
+def fallback_analysis(resume_text, recommendation, general_thoughts, reason='error'):
+    """Degraded path when Gemini cannot produce a result: the local fast-mode analysis; never cached"""
+    metrics.increment("fallback_analyses_total", reason=reason)
+    try:
+        analysis = fast_analyzer.analyze(resume_text)
+    except Exception as e:
+        print(f"Error in fast analysis: {e}")
+        analysis = dict(ANALYSIS_DEFAULTS, contact_info=extract_contact_info(resume_text))
+    analysis.update(
+        match_score=0,
+        match_details={},
+        recommendations=[recommendation] + analysis.get("recommendations", []),
+        general_thoughts=general_thoughts,
+        analysis_mode="degraded",
+        # Truthy like any fallback marker; the reason labels the repeat-analysis metric
+        _fallback=reason
+    )
+    return analysis
+
+
+ANALYSIS_JSON_TEMPLATE = """Return only valid JSON with this structure:
+{"contact_info":{"emails":[],"phones":[],"linkedin":[]},"skills":[],"experience_years":0,"education":[],"recommendations":[],"summary":"","resume_description":"","general_thoughts":""}
+"""
+
+ANALYSIS_PROMPT_GUIDELINES = """Guidelines:
+- contact_info: emails, phone numbers and LinkedIn profile URLs found in the text
+- skills: all relevant technical and soft skills
+- experience_years: integer, from patterns like "X years of experience" or the employment dates
+- education: educational qualifications
+- recommendations: specific, actionable improvements, tailored to the job profile if one is given (match scores are computed separately)
+- summary: brief summary of the candidate's profile
+- resume_description: career progression, key achievements, education background, notable projects
+- general_thoughts: formatting, content quality, completeness, presentation, strengths and weaknesses
+"""
+
+ANALYSIS_PROMPT_INSTRUCTIONS = (
+    "Analyze the resume below.\n"
+    + ("" if GEMINI_STRUCTURED_OUTPUT else ANALYSIS_JSON_TEMPLATE)
+    + ANALYSIS_PROMPT_GUIDELINES
+)
+
+# Fields every analysis carries, with the defaults used when the model omits them
+ANALYSIS_DEFAULTS = ResumeAnalysis().to_dict()
+
+def response_text_of(response):
+    """Concatenate the text parts of a Gemini response (or streamed chunk)"""
+    # Extract text from response candidates for Gemini 2.5 Pro
+    response_text = ""
+    if response.candidates:
+        for candidate in response.candidates:
+            parts = candidate.content.parts
+            if parts:
+                for part in parts:
+                    if part.text:
+                        response_text += part.text
+    else:
+        # Fallback to original method
+        response_text = response.text
+    return response_text
+
+def build_analysis_prompt(resume_text, job_profile_key=None):
+    """Analysis prompt for a resume, plus slimming stats for the resume text it contains"""
     job_profile_info = ""
-    if job_profile_key and job_profile_key in JOB_PROFILES:
-        profile = JOB_PROFILES[job_profile_key]
-        job_profile_info = f"""
-        
-Job Profile: {profile['name']}
-        Required Skills: {', '.join(profile['required_skills'])}
-        Preferred Skills: {', '.join(profile['preferred_skills'])}
-        Experience Keywords: {', '.join(profile['experience_keywords'])}
-        Education Keywords: {', '.join(profile['education_keywords'])}
-        """
-    
-    prompt = f"""
-    Analyze the following resume text and provide a comprehensive analysis in JSON format.
-    {job_profile_info}
+    profile = job_profiles().get(job_profile_key) if job_profile_key else None
+    if profile:
+        job_profile_info = (
+            f"Job profile: {profile['name']}\n"
+            f"Required skills: {', '.join(profile['required_skills'])}\n"
+            f"Preferred skills: {', '.join(profile['preferred_skills'])}\n"
+            f"Experience keywords: {', '.join(profile['experience_keywords'])}\n"
+            f"Education keywords: {', '.join(profile['education_keywords'])}\n\n"
+        )
     
-    Resume Text:
-    {resume_text}
+    slim_text, prompt_stats = slim_resume_text(resume_text, PROMPT_TOKEN_BUDGET)
+    metrics.increment("prompt_tokens_saved_total", prompt_stats['tokens_saved'])
     
-    Please provide the analysis in the following JSON structure:
-    {{
-        "contact_info": {{
-            "emails": ["list of email addresses found"],
-            "phones": ["list of phone numbers found"],
-            "linkedin": ["list of LinkedIn profile URLs found"]
-        }},
-        "skills": ["list of technical and professional skills identified"],
-        "experience_years": "number of years of experience (as integer)",
-        "education": ["list of educational qualifications found"],
-        "match_score": "overall match score out of 100 (if job profile provided)",
-        "match_details": {{
-            "required_skills_match": "X/Y format showing matches",
-            "preferred_skills_match": "X/Y format showing matches",
-            "experience_keywords_match": "X/Y format showing matches",
-            "education_keywords_match": "X/Y format showing matches",
-            "required_score": "score for required skills (0-40)",
-            "preferred_score": "score for preferred skills (0-25)",
-            "experience_score": "score for experience keywords (0-20)",
-            "education_score": "score for education keywords (0-15)"
-        }},
-        "recommendations": ["list of specific recommendations to improve the resume"],
-        "summary": "brief summary of the candidate's profile",
-        "resume_description": "detailed description of what the resume contains, including key highlights, career progression, and notable achievements",
-        "general_thoughts": "overall evaluation and thoughts about the resume quality, presentation, strengths, and areas for improvement"
-    }}
-    
-    Important guidelines:
-    - Extract contact information accurately using pattern recognition
-    - Identify all relevant technical and soft skills
-    - Calculate experience years from text patterns like "X years of experience"
-    - For match scoring (if job profile provided): use weighted scoring - Required skills: 40%, Preferred skills: 25%, Experience keywords: 20%, Education keywords: 15%
-    - Provide actionable recommendations for resume improvement
-    - For resume_description: Include career progression, key achievements, education background, and notable projects or experiences
-    - For general_thoughts: Evaluate resume formatting, content quality, completeness, professional presentation, and overall impression
-    - Return only valid JSON, no additional text
-    """
+    # Static instructions first, then the per-request profile and resume text
+    prompt = f"{ANALYSIS_PROMPT_INSTRUCTIONS}\n{job_profile_info}Resume:\n{slim_text}"
+    return prompt, prompt_stats
+
+def analyze_resume_with_gemini(resume_text, job_profile_key=None, priority=INTERACTIVE):
+    """Use Gemini API to analyze resume comprehensively"""
+    with metrics.span("build_prompt"):
+        prompt, prompt_stats = build_analysis_prompt(resume_text, job_profile_key)
     
-    max_retries = 3
-    retry_delay = 1
+    try:
+        # Retries and rate-limit backoff are handled centrally by the scheduler
+        with metrics.span("gemini_call"):
+            response = gemini_scheduler.generate(prompt, priority=priority, **ANALYSIS_OUTPUT)
+    except Exception as e:
+        return gemini_error_analysis(resume_text, e)
+    return parse_analysis_response(resume_text, response, prompt_stats)
+
+def parse_analysis_response(resume_text, response, prompt_stats):
+    """Analysis dict from a Gemini response, or the fallback analysis if none can be recovered"""
+    try:
+        response_text = response_text_of(response)
+    except Exception as e:
+        # For example a response blocked by the safety filters, which has no text
+        return gemini_error_analysis(resume_text, e)
+    return analysis_from_text(resume_text, response_text, prompt_stats)
+
+def analysis_from_text(resume_text, response_text, prompt_stats, source="analysis"):
+    """Typed analysis from model output; truncated or malformed JSON is repaired if enough of it survives"""
+    try:
+        with metrics.span("parse_json"):
+            data, repaired = parse_json_lenient(response_text)
+            analysis = ResumeAnalysis.from_model(data)
+        if repaired and not analysis.is_usable():
+            raise ValueError("Too little of the analysis survived JSON repair")
+    except ValueError as e:
+        print(f"JSON parsing error: {e}")
+        print(f"Response text: {response_text}")
+        metrics.increment("json_parse_failures_total", source=source)
+        return fallback_analysis(
+            resume_text,
+            "JSON parsing error in AI response. Please try again.",
+            "AI analysis unavailable due to a parsing error; showing a local fast-mode analysis instead.",
+            reason="parse_error"
+        )
+    if repaired:
+        metrics.increment("json_repairs_total", source=source)
+    return dict(analysis.to_dict(), prompt_stats=prompt_stats)
+
+def gemini_error_analysis(resume_text, error):
+    """Fallback analysis for a failed Gemini call"""
+    print(f"Error with Gemini API: {error}")
     
-    for attempt in range(max_retries):
-        try:
-            response = model.generate_content(prompt)
-            # Extract text from response candidates for Gemini 2.5 Pro
-            response_text = ""
-            if response.candidates:
-                for candidate in response.candidates:
-                    parts = candidate.content.parts
-                    if parts:
-                        for part in parts:
-                            if part.text:
-                                response_text += part.text
-            else:
-                # Fallback to original method
-                response_text = response.text
-            
-            response_text = response_text.strip()
-            
-            # Remove markdown code blocks if present
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.startswith('```'):
-                response_text = response_text[3:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
-            
-            response_text = response_text.strip()
-            
-            # Parse JSON response
-            analysis_result = json.loads(response_text)
-            
-            # Validate and ensure all required fields exist
-            required_fields = {
-                "contact_info": {},
-                "skills": [],
-                "experience_years": 0,
-                "education": [],
-                "match_score": 0,
-                "match_details": {},
-                "recommendations": [],
-                "summary": "",
-                "resume_description": "",
-                "general_thoughts": ""
-            }
-            
-            for field, default_value in required_fields.items():
-                if field not in analysis_result:
-                    analysis_result[field] = default_value
-            
-            return analysis_result
-            
-        except json.JSONDecodeError as e:
-            print(f"JSON parsing error: {e}")
-            print(f"Response text: {response_text}")
-            return {
-                "contact_info": extract_contact_info_fallback(resume_text),
-                "skills": [],
-                "experience_years": 0,
-                "education": [],
-                "match_score": 0,
-                "match_details": {},
-                "recommendations": ["JSON parsing error in AI response. Please try again."],
-                "summary": "Analysis unavailable due to parsing error.",
-                "resume_description": "Unable to generate description due to parsing error.",
-                "general_thoughts": "Analysis unavailable due to technical error."
+    # Check if it's a rate limit error (the scheduler has already retried)
+    if is_rate_limit_error(error):
+        return fallback_analysis(
+            resume_text,
+            "Rate limit exceeded. Please try again later or upgrade your Gemini API plan.",
+            "AI analysis unavailable due to API rate limits; showing a local fast-mode analysis instead.",
+            reason="rate_limited"
+        )
+    # Non-rate-limit error
+    return fallback_analysis(
+        resume_text,
+        f"Error occurred during AI analysis: {str(error)}",
+        "AI analysis unavailable due to a technical error; showing a local fast-mode analysis instead."
+    )
+
+def extract_resume_profile(resume_text, priority=INTERACTIVE):
+    """Phase one: profile-independent extraction, computed once per resume and cached by its text hash"""
+    extraction, signature = lookup_extraction(resume_text)
+    if extraction is not None:
+        return extraction
+
+    extraction = analyze_resume_with_gemini(resume_text, priority=priority)
+    return store_extraction(resume_text, extraction, signature)
+
+def lookup_extraction(resume_text):
+    """(cached or near-duplicate extraction, or None; MinHash signature for store_extraction)"""
+    cached = analysis_cache.get(make_cache_key(resume_text))
+    if cached is not None:
+        return cached, None
+
+    with metrics.span("near_duplicate_lookup"):
+        near_duplicates = get_near_duplicates()
+        signature = near_duplicates.signature(resume_text) if near_duplicates is not None else None
+        reused = reuse_near_duplicate(resume_text, signature)
+    if reused is None:
+        previous_fallback = pop_recent_fallback(text_hash(resume_text))
+        if previous_fallback:
+            metrics.increment("repeat_analyses_total", previous=previous_fallback)
+    return reused, signature
+
+def store_extraction(resume_text, extraction, signature):
+    """Add keyword n-grams to a fresh Gemini extraction and cache it unless it is a fallback"""
+    if "keyword_terms" not in extraction:
+        extraction["keyword_terms"] = sorted(resume_ngrams(resume_text))
+    if extraction.get("_fallback"):
+        note_recent_fallback(text_hash(resume_text), extraction["_fallback"])
+    else:
+        analysis_cache.set(make_cache_key(resume_text), extraction)
+        remember_signature(resume_text, signature)
+    return extraction
+
+# Resumes whose last analysis fell back, so the repeat calls that fallbacks cause can be counted
+RECENT_FALLBACKS_SIZE = 1024
+recent_fallbacks = OrderedDict()
+recent_fallbacks_lock = threading.Lock()
+
+def note_recent_fallback(resume_hash, reason):
+    with recent_fallbacks_lock:
+        recent_fallbacks[resume_hash] = str(reason)
+        recent_fallbacks.move_to_end(resume_hash)
+        if len(recent_fallbacks) > RECENT_FALLBACKS_SIZE:
+            recent_fallbacks.popitem(last=False)
+
+def pop_recent_fallback(resume_hash):
+    with recent_fallbacks_lock:
+        return recent_fallbacks.pop(resume_hash, None)
+
+def reuse_near_duplicate(resume_text, signature):
+    """Cached extraction of a near-identical resume, with contact info and n-grams redone locally"""
+    if signature is None:
+        return None
+    matches = get_near_duplicates().query(signature, exclude=text_hash(resume_text))
+    for resume_hash, similarity in matches:
+        prior = analysis_cache.get(cache_key_for_hash(resume_hash))
+        if prior is None:
+            continue
+        # Never the prior resume's details: contact info the regexes miss stays empty
+        extraction = dict(
+            prior,
+            contact_info=extract_contact_info(resume_text),
+            keyword_terms=sorted(resume_ngrams(resume_text)),
+            near_duplicate={
+                "similarity": round(similarity, 3),
+                "matched_ids": [match_hash for match_hash, _ in matches]
             }
-        except Exception as e:
-            error_str = str(e)
-            print(f"Error with Gemini API (attempt {attempt + 1}): {e}")
-            
-            # Check if it's a rate limit error
-            if "429" in error_str or "quota" in error_str.lower():
-                if attempt < max_retries - 1:
-                    # Extract retry delay from error message if available
-                    if "retry_delay" in error_str:
-                        try:
-                            import re
-                            delay_match = re.search(r'seconds: (\d+)', error_str)
-                            if delay_match:
-                                retry_delay = int(delay_match.group(1))
-                        except:
-                            pass
-                    
-                    print(f"Rate limit hit. Waiting {retry_delay} seconds before retry...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                    continue
-                else:
-                    return {
-                        "contact_info": extract_contact_info_fallback(resume_text),
-                        "skills": [],
-                        "experience_years": 0,
-                        "education": [],
-                        "match_score": 0,
-                        "match_details": {},
-                        "recommendations": ["Rate limit exceeded. Please try again later or upgrade your Gemini API plan."],
-                        "summary": "Analysis unavailable due to rate limiting.",
-                        "resume_description": "Unable to generate description due to rate limiting.",
-                        "general_thoughts": "Analysis unavailable due to API rate limits."
-                    }
-            else:
-                # Non-rate-limit error, return immediately
-                return {
-                    "contact_info": extract_contact_info_fallback(resume_text),
-                    "skills": [],
-                    "experience_years": 0,
-                    "education": [],
-                    "match_score": 0,
-                    "match_details": {},
-                    "recommendations": [f"Error occurred during AI analysis: {error_str}"],
-                    "summary": "Analysis unavailable due to technical error.",
-                    "resume_description": "Unable to generate description due to technical error.",
-                    "general_thoughts": "Analysis unavailable due to technical error."
-                }
-
-@app.route('/api/health', methods=['GET'])
+        )
+        # Cached for exact resubmissions, but not indexed, so reuse never chains away from a real analysis
+        analysis_cache.set(make_cache_key(resume_text), extraction)
+        return extraction
+    return None
+
+def remember_signature(resume_text, signature):
+    if signature is not None:
+        get_near_duplicates().add(text_hash(resume_text), signature)
+
+def score_extraction(extraction, job_profile_key):
+    """Phase two: profile-specific match scoring, done locally on the compact extraction"""
+    # Reading the snapshot first also makes sure persisted custom profiles have been loaded
+    profile = job_profiles().get(job_profile_key) if job_profile_key else None
+    if profile is None or not keyword_matcher.has_profile(job_profile_key):
+        return extraction
+
+    ngrams = set(extraction.get("keyword_terms", []))
+    match_score, match_details = keyword_matcher.score_ngrams(ngrams, job_profile_key)
+    recommendations = list(extraction.get("recommendations", []))
+    missing = keyword_matcher.missing_terms(ngrams, job_profile_key)
+    if missing:
+        recommendations.insert(
+            0, f"Highlight experience with these {profile['name']} required skills if you have it: {', '.join(missing[:6])}"
+        )
+    return dict(extraction, match_score=match_score, match_details=match_details, recommendations=recommendations)
+
+def analyze_resume_cached(resume_text, job_profile_key=None, priority=INTERACTIVE):
+    """Cached profile-independent extraction followed by cheap local scoring for the profile"""
+    return score_extraction(extract_resume_profile(resume_text, priority), job_profile_key)
+
+def fast_extractions(resume_texts):
+    """Local stand-in for phase one: fast-mode analyses of several resumes in one batched pass"""
+    return [
+        dict(analysis, keyword_terms=sorted(resume_ngrams(resume_text)))
+        for resume_text, analysis in zip(resume_texts, fast_analyzer.analyze_many(resume_texts))
+    ]
+
+def analyze_resume_text(filename, resume_text, job_profile, priority=INTERACTIVE, mode='full'):
+    """Analyze extracted text, record the candidate in the search index and shape the response"""
+    if mode == 'fast':
+        return analyze_resume_fast(filename, resume_text, job_profile)
+
+    extraction = extract_resume_profile(resume_text, priority)
+    return finish_analysis(filename, resume_text, job_profile, extraction)
+
+def fast_analysis(resume_text, job_profile):
+    # No network call; not indexed, so a later full analysis of the same resume still is
+    with metrics.span("fast_analysis"):
+        return score_extraction(fast_extractions([resume_text])[0], job_profile)
+
+def analyze_resume_fast(filename, resume_text, job_profile):
+    return build_analysis_response(filename, resume_text, job_profile, fast_analysis(resume_text, job_profile))
+
+def finish_analysis(filename, resume_text, job_profile, extraction):
+    """Score a phase-one extraction for the profile, index the candidate and shape the response"""
+    gemini_analysis = score_extraction(extraction, job_profile)
+    with metrics.span("index_candidate"):
+        record_candidate(filename, resume_text, gemini_analysis, job_profile)
+    return build_analysis_response(filename, resume_text, job_profile, gemini_analysis)
+
+def record_candidate(filename, resume_text, gemini_analysis, job_profile):
+    """Add a successful analysis to the candidate search index"""
+    if gemini_analysis.get("_fallback"):
+        return
+    try:
+        get_candidate_index().add(
+            text_hash(resume_text), filename, gemini_analysis,
+            terms=keyword_matcher.find_terms(resume_text), job_profile=job_profile
+        )
+    except Exception as e:
+        print(f"Error indexing candidate: {e}")
+
+def build_analysis_response(filename, resume_text, job_profile, gemini_analysis):
+    """Shape an analysis into the payload returned by the analyze endpoints"""
+    return {
+        "filename": filename,
+        "resume_id": text_hash(resume_text),
+        "contact_info": gemini_analysis.get("contact_info", {}),
+        "skills": gemini_analysis.get("skills", []),
+        "experience_years": gemini_analysis.get("experience_years", 0),
+        "education": gemini_analysis.get("education", []),
+        "match_score": gemini_analysis.get("match_score", 0),
+        "match_details": gemini_analysis.get("match_details", {}),
+        "recommendations": gemini_analysis.get("recommendations", []),
+        "summary": gemini_analysis.get("summary", ""),
+        "resume_description": gemini_analysis.get("resume_description", ""),
+        "general_thoughts": gemini_analysis.get("general_thoughts", ""),
+        "job_profile": job_profiles().get(job_profile, {}).get("name", "") if job_profile else "",
+        "word_count": len(resume_text.split()),
+        "character_count": len(resume_text),
+        "prompt_stats": gemini_analysis.get("prompt_stats", {}),
+        "analysis_mode": gemini_analysis.get("analysis_mode", "full"),
+        "near_duplicate": gemini_analysis.get("near_duplicate", {})
+    }
+
+@api.route('/api/health', methods=['GET'])
 def health_check():
     return jsonify({"status": "healthy", "message": "Resume Analysis API is running"})
 
-@app.route('/api/job-profiles', methods=['GET'])
+@api.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    stats = analysis_cache.stats()
+    near_duplicates = get_near_duplicates()
+    stats["near_duplicates"] = near_duplicates.stats() if near_duplicates is not None else {"enabled": False}
+    stats["job_profiles"] = profile_store.stats()
+    return jsonify(stats)
+
+@api.route('/api/scheduler/stats', methods=['GET'])
+def scheduler_stats():
+    return jsonify(gemini_scheduler.stats())
+
+def service_gauges():
+    """Point-in-time values from the caches, scheduler and index, added to /api/metrics"""
+    cache = analysis_cache.stats()
+    scheduler = gemini_scheduler.stats()
+    return {
+        "analysis_cache_entries": cache["entries"],
+        "analysis_cache_hit_rate": float(cache["hit_rate"]),
+        "gemini_queue_depth": scheduler["queue_depth"],
+        "gemini_in_flight": scheduler["in_flight"],
+        "gemini_backoff_remaining_seconds": float(scheduler["backoff_remaining_seconds"]),
+        "candidate_index_size": len(get_candidate_index()),
+        "job_profiles": len(job_profiles())
+    }
+
+metrics.add_gauges(service_gauges)
+
+@api.before_app_request
+def start_request_timing():
+    g.request_started = time.perf_counter()
+    g.metrics_token = metrics.start_request()
+
+@api.after_app_request
+def record_request_timing(response):
+    if 'metrics_token' not in g:
+        return response
+    elapsed = time.perf_counter() - g.request_started
+    stages = metrics.finish_request(g.metrics_token)
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.observe("http_request_seconds", elapsed, endpoint=endpoint, method=request.method)
+    metrics.increment("http_requests_total", endpoint=endpoint, method=request.method, status=str(response.status_code))
+    if METRICS_TIMING_HEADERS:
+        # Streamed responses only report the stages that ran before the body started
+        timings = stages + [("total", elapsed)]
+        response.headers["Server-Timing"] = server_timing(timings)
+    return response
+
+@api.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@api.route('/api/job-profiles', methods=['GET'])
 def get_job_profiles():
+    return jsonify(job_profile_list())
+
+def job_profile_list():
     profiles = []
-    for key, profile in JOB_PROFILES.items():
+    for key, profile in job_profiles().items():
         profiles.append({
             "id": key,
             "name": profile["name"]
         })
-    return jsonify(profiles)
+    return profiles
+
+JOB_PROFILE_JSON_TEMPLATE = """Return only valid JSON with this structure:
+{"required_skills":[],"preferred_skills":[],"experience_keywords":[],"education_keywords":[]}
+"""
+
+def job_profile_prompt(job_role):
+    template = "" if GEMINI_STRUCTURED_OUTPUT else JOB_PROFILE_JSON_TEMPLATE
+    return f"""Generate a profile of skills and keywords for the job role "{job_role}".
+{template}- required_skills: 8-12 essential technical and professional skills
+- preferred_skills: 6-10 additional skills that would be beneficial
+- experience_keywords: 6-8 action verbs commonly found in resumes for this role
+- education_keywords: 4-6 relevant educational backgrounds or fields
+Use current industry terms specific to the role, in lowercase, with soft skills where appropriate.
+"""
 
 def generate_job_profile_with_gemini(job_role):
     """Use Gemini to generate job profile skills and keywords based on job role"""
-    prompt = f"""
-    Based on the job role "{job_role}", generate a comprehensive job profile with relevant skills and keywords.
-    
-    Please provide the response in the following JSON structure:
-    {{
-        "required_skills": ["list of 8-12 essential technical and professional skills for this role"],
-        "preferred_skills": ["list of 6-10 additional skills that would be beneficial"],
-        "experience_keywords": ["list of 6-8 action words/verbs commonly found in resumes for this role"],
-        "education_keywords": ["list of 4-6 educational backgrounds or fields relevant to this role"]
-    }}
-    
-    Guidelines:
-    - Focus on current industry standards and requirements
-    - Include both technical and soft skills where appropriate
-    - Make skills specific and relevant to the role
-    - Use lowercase for consistency
-    - Return only valid JSON, no additional text
-    """
-    
     try:
-        response = model.generate_content(prompt)
-        response_text = ""
-        if response.candidates:
-            for candidate in response.candidates:
-                parts = candidate.content.parts
-                if parts:
-                    for part in parts:
-                        if part.text:
-                            response_text += part.text
-        else:
-            response_text = response.text
-        
-        response_text = response_text.strip()
-        
-        # Remove markdown code blocks if present
-        if response_text.startswith('```json'):
-            response_text = response_text[7:]
-        if response_text.startswith('```'):
-            response_text = response_text[3:]
-        if response_text.endswith('```'):
-            response_text = response_text[:-3]
-        
-        response_text = response_text.strip()
-        
-        # Parse JSON response
-        profile_data = json.loads(response_text)
-        
-        # Validate required fields
-        required_fields = ["required_skills", "preferred_skills", "experience_keywords", "education_keywords"]
-        for field in required_fields:
-            if field not in profile_data:
-                profile_data[field] = []
-        
-        return profile_data
-        
+        with metrics.span("profile_gemini_call"):
+            response = gemini_scheduler.generate(job_profile_prompt(job_role), **JOB_PROFILE_OUTPUT)
     except Exception as e:
         print(f"Error generating profile with Gemini: {e}")
-        # Return default structure if Gemini fails
-        return {
-            "required_skills": [],
-            "preferred_skills": [],
-            "experience_keywords": [],
-            "education_keywords": []
-        }
-
-@app.route('/api/job-profiles', methods=['POST'])
+        return empty_generated_profile()
+    return parse_job_profile_response(response)
+
+def parse_job_profile_response(response):
+    try:
+        response_text = response_text_of(response)
+        with metrics.span("profile_parse_json"):
+            data, repaired = parse_json_lenient(response_text)
+    except Exception as e:
+        print(f"Error generating profile with Gemini: {e}")
+        if isinstance(e, ValueError):
+            metrics.increment("json_parse_failures_total", source="job_profile")
+        return empty_generated_profile()
+    if repaired:
+        metrics.increment("json_repairs_total", source="job_profile")
+    return GeneratedProfile.from_model(data).to_dict()
+
+GENERATED_PROFILE_FIELDS = tuple(GeneratedProfile.__dataclass_fields__)
+
+def empty_generated_profile():
+    # Returned when Gemini fails; the store does not cache it, so the next request tries again
+    return GeneratedProfile().to_dict()
+
+def new_profile_id(data):
+    """(profile id for a create request, or None with the validation error)"""
+    if not data or 'name' not in data:
+        return None, "Profile name is required"
+    
+    # Generate a unique ID for the new profile
+    profile_id = normalize_term(data['name']).replace(' ', '_').replace('-', '_')
+    
+    # Check if profile already exists
+    if profile_id in job_profiles():
+        return None, "Profile with this name already exists"
+    return profile_id, None
+
+def build_job_profile(name, gemini_profile):
+    # Create new profile with Gemini-generated data
+    profile = {"name": name}
+    for field in GENERATED_PROFILE_FIELDS:
+        profile[field] = gemini_profile.get(field, [])
+    return profile
+
+@api.route('/api/job-profiles', methods=['POST'])
 def create_job_profile():
     try:
         data = request.get_json()
+        profile_id, error = new_profile_id(data)
+        if error:
+            return jsonify({"error": error}), 400
         
-        if not data or 'name' not in data:
-            return jsonify({"error": "Profile name is required"}), 400
-        
-        # Generate a unique ID for the new profile
-        profile_id = data['name'].lower().replace(' ', '_').replace('-', '_')
+        # Generate profile data using Gemini; concurrent requests for the same role share one call
+        gemini_profile = profile_store.generate(data['name'], generate_job_profile_with_gemini)
+        new_profile = build_job_profile(data['name'], gemini_profile)
         
-        # Check if profile already exists
-        if profile_id in JOB_PROFILES:
+        # Publish to the store, which persists it and updates the matching engines
+        if not profile_store.add(profile_id, new_profile):
             return jsonify({"error": "Profile with this name already exists"}), 400
         
-        # Generate profile data using Gemini
-        gemini_profile = generate_job_profile_with_gemini(data['name'])
-        
-        # Create new profile with Gemini-generated data
-        new_profile = {
-            "name": data['name'],
-            "required_skills": gemini_profile.get('required_skills', []),
-            "preferred_skills": gemini_profile.get('preferred_skills', []),
-            "experience_keywords": gemini_profile.get('experience_keywords', []),
-            "education_keywords": gemini_profile.get('education_keywords', [])
-        }
-        
-        # Add to JOB_PROFILES
-        JOB_PROFILES[profile_id] = new_profile
-        
         return jsonify({
             "id": profile_id,
             "name": new_profile["name"],
@@ -423,25 +789,25 @@ def create_job_profile():
     except Exception as e:
         return jsonify({"error": f"Error creating profile: {str(e)}"}), 500
 
-@app.route('/api/job-profiles/<profile_id>', methods=['DELETE'])
+@api.route('/api/job-profiles/<profile_id>', methods=['DELETE'])
 def delete_job_profile(profile_id):
     try:
-        if profile_id not in JOB_PROFILES:
+        if profile_id not in job_profiles():
             return jsonify({"error": "Profile not found"}), 404
         
         # Don't allow deletion of default profiles
-        default_profiles = ["software_engineer", "data_scientist", "marketing_manager"]
-        if profile_id in default_profiles:
+        if profile_store.is_default(profile_id):
             return jsonify({"error": "Cannot delete default profiles"}), 400
         
-        del JOB_PROFILES[profile_id]
+        if not profile_store.remove(profile_id):
+            return jsonify({"error": "Profile not found"}), 404
         
         return jsonify({"message": "Profile deleted successfully"}), 200
         
     except Exception as e:
         return jsonify({"error": f"Error deleting profile: {str(e)}"}), 500
 
-@app.route('/api/analyze-resume', methods=['POST'])
+@api.route('/api/analyze-resume', methods=['POST'])
 def analyze_resume():
     try:
         # Check if file is present
@@ -450,55 +816,517 @@ def analyze_resume():
         
         file = request.files['resume']
         job_profile = request.form.get('job_profile', '')
+        mode = request.form.get('mode', 'full')
         
-        if file.filename == '':
-            return jsonify({"error": "No file selected"}), 400
-        
-        if not allowed_file(file.filename):
-            return jsonify({"error": "File type not supported. Please upload PDF, DOC, DOCX, or TXT files"}), 400
+        error = upload_error(file.filename, mode)
+        if error:
+            return jsonify({"error": error}), 400
         
-        # Save file
         filename = secure_filename(file.filename)
-        file_path = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(file_path)
         
-        try:
-            # Extract text from file
-            resume_text = extract_text_from_file(file_path, filename)
-            
-            if not resume_text.strip():
-                return jsonify({"error": "Could not extract text from the resume"}), 400
-            
-            # Perform AI analysis using Gemini
-            gemini_analysis = analyze_resume_with_gemini(resume_text, job_profile)
-            
-            # Prepare response
-            analysis_result = {
-                "filename": filename,
-                "contact_info": gemini_analysis.get("contact_info", {}),
-                "skills": gemini_analysis.get("skills", []),
-                "experience_years": gemini_analysis.get("experience_years", 0),
-                "education": gemini_analysis.get("education", []),
-                "match_score": gemini_analysis.get("match_score", 0),
-                "match_details": gemini_analysis.get("match_details", {}),
-                "recommendations": gemini_analysis.get("recommendations", []),
-                "summary": gemini_analysis.get("summary", ""),
-                "resume_description": gemini_analysis.get("resume_description", ""),
-                "general_thoughts": gemini_analysis.get("general_thoughts", ""),
-                "job_profile": JOB_PROFILES.get(job_profile, {}).get("name", "") if job_profile else "",
-                "word_count": len(resume_text.split()),
-                "character_count": len(resume_text)
-            }
-            
-            return jsonify(analysis_result)
+        # Extract text straight from the in-memory (or spooled) upload stream
+        with metrics.span("extract_text"):
+            resume_text, extraction_stats = extract_text_with_stats(file.stream, filename)
+        
+        if not resume_text.strip():
+            return jsonify({"error": "Could not extract text from the resume"}), 400
+        
+        # Perform AI analysis using Gemini
+        analysis_result = analyze_resume_text(filename, resume_text, job_profile, mode=mode)
+        if extraction_stats:
+            analysis_result["extraction_stats"] = extraction_stats
         
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(file_path):
-                os.remove(file_path)
+        return jsonify(analysis_result)
     
     except Exception as e:
         return jsonify({"error": f"An error occurred during analysis: {str(e)}"}), 500
 
+def sse_event(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
+
+def complete_analysis_events(filename, resume_text, job_profile, analysis):
+    """SSE events for an analysis that is already complete: every field, then the result"""
+    for field, value in analysis.items():
+        if field in ANALYSIS_DEFAULTS:
+            yield sse_event("field", {"field": field, "value": value})
+    yield sse_event("result", build_analysis_response(filename, resume_text, job_profile, analysis))
+
+def stream_resume_analysis(filename, resume_text, job_profile, mode='full'):
+    """Yield SSE events: each top-level analysis field as soon as Gemini has produced it, then the full result"""
+    if mode == 'fast':
+        yield from complete_analysis_events(filename, resume_text, job_profile, fast_analysis(resume_text, job_profile))
+        return
+
+    cached, signature = lookup_extraction(resume_text)
+    if cached is not None:
+        yield from complete_analysis_events(filename, resume_text, job_profile, score_extraction(cached, job_profile))
+        return
+
+    # Profile scoring is local, so match scores can be sent before the model has produced anything
+    ngrams = sorted(resume_ngrams(resume_text))
+    local_scores = score_extraction({"keyword_terms": ngrams}, job_profile)
+    if "match_score" in local_scores:
+        yield sse_event("field", {"field": "match_score", "value": local_scores["match_score"]})
+        yield sse_event("field", {"field": "match_details", "value": local_scores["match_details"]})
+
+    prompt, prompt_stats = build_analysis_prompt(resume_text)
+    parser = TopLevelFieldParser()
+    extraction = {}
+    streamed_text = ""
+    try:
+        for chunk in gemini_scheduler.stream(prompt, **ANALYSIS_OUTPUT):
+            chunk_text = response_text_of(chunk)
+            streamed_text += chunk_text
+            for field, value in parser.feed(chunk_text):
+                extraction[field] = value
+                if field not in ("match_score", "match_details", "recommendations"):
+                    yield sse_event("field", {"field": field, "value": value})
+    except Exception as e:
+        print(f"Error with Gemini API stream: {e}")
+        if is_rate_limit_error(e):
+            extraction = fallback_analysis(
+                resume_text,
+                "Rate limit exceeded. Please try again later or upgrade your Gemini API plan.",
+                "AI analysis unavailable due to API rate limits; showing a local fast-mode analysis instead.",
+                reason="rate_limited"
+            )
+        else:
+            extraction = fallback_analysis(
+                resume_text,
+                f"Error occurred during AI analysis: {str(e)}",
+                "AI analysis unavailable due to a technical error; showing a local fast-mode analysis instead."
+            )
+    else:
+        if parser.finished:
+            extraction = dict(ResumeAnalysis.from_model(extraction).to_dict(), prompt_stats=prompt_stats)
+        else:
+            print("Streamed Gemini response ended before the JSON object was complete")
+            extraction = analysis_from_text(resume_text, streamed_text, prompt_stats, source="stream")
+
+    extraction["keyword_terms"] = ngrams
+    extraction = store_extraction(resume_text, extraction, signature)
+    analysis = score_extraction(extraction, job_profile)
+    # Recommendations are sent once the profile-specific ones have been merged in
+    yield sse_event("field", {"field": "recommendations", "value": analysis["recommendations"]})
+    record_candidate(filename, resume_text, analysis, job_profile)
+    yield sse_event("result", build_analysis_response(filename, resume_text, job_profile, analysis))
+
+@api.route('/api/analyze-resume/stream', methods=['POST'])
+def analyze_resume_stream():
+    try:
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
+
+        file = request.files['resume']
+        job_profile = request.form.get('job_profile', '')
+        mode = request.form.get('mode', 'full')
+
+        error = upload_error(file.filename, mode)
+        if error:
+            return jsonify({"error": error}), 400
+
+        filename = secure_filename(file.filename)
+        resume_text = extract_text_from_file(file.stream, filename)
+
+        if not resume_text.strip():
+            return jsonify({"error": "Could not extract text from the resume"}), 400
+
+    except Exception as e:
+        return jsonify({"error": f"An error occurred during analysis: {str(e)}"}), 500
+
+    return Response(
+        stream_with_context(stream_resume_analysis(filename, resume_text, job_profile, mode)),
+        mimetype='text/event-stream',
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+_extraction_pool = None
+_batch_analysis_pool = None
+_batch_pools_lock = threading.Lock()
+
+def get_batch_pools():
+    """Lazily create the shared extraction process pool and bounded analysis thread pool"""
+    global _extraction_pool, _batch_analysis_pool
+    with _batch_pools_lock:
+        if _extraction_pool is None:
+            _extraction_pool = ProcessPoolExecutor(max_workers=BATCH_EXTRACT_WORKERS)
+        if _batch_analysis_pool is None:
+            _batch_analysis_pool = ThreadPoolExecutor(max_workers=BATCH_MAX_IN_FLIGHT)
+    return _extraction_pool, _batch_analysis_pool
+
+class BatchLimitError(ValueError):
+    """A batch upload has too many files or too many bytes once expanded"""
+
+    def __init__(self, message, status_code):
+        super().__init__(message)
+        self.status_code = status_code
+
+def collect_batch_uploads(files):
+    """Read uploaded files (expanding zip archives) into (filename, bytes) pairs.
+
+    Limits are checked before each file is read, so a zip bomb is rejected without
+    decompressing it (zipfile stops at each entry's declared size).
+    """
+    uploads = []
+    skipped = []
+    total_bytes = 0
+
+    def add(name, size, read):
+        nonlocal total_bytes
+        if len(uploads) >= BATCH_MAX_FILES:
+            raise BatchLimitError(f"Too many files in batch (max {BATCH_MAX_FILES})", 400)
+        total_bytes += size
+        if total_bytes > BATCH_MAX_BYTES:
+            raise BatchLimitError(f"Batch too large (max {BATCH_MAX_BYTES // (1024 * 1024)}MB uncompressed)", 413)
+        uploads.append((name, read()))
+
+    for file in files:
+        if not file or file.filename == '':
+            continue
+        filename = secure_filename(file.filename)
+        if filename.lower().endswith('.zip'):
+            with zipfile.ZipFile(io.BytesIO(file.read())) as archive:
+                for info in archive.infolist():
+                    entry_name = secure_filename(os.path.basename(info.filename))
+                    if info.is_dir() or not entry_name:
+                        continue
+                    if not allowed_file(entry_name):
+                        skipped.append(entry_name)
+                        continue
+                    if info.file_size > MAX_CONTENT_LENGTH:
+                        skipped.append(entry_name)
+                        continue
+                    add(entry_name, info.file_size, functools.partial(archive.read, info))
+        elif allowed_file(filename):
+            data = file.read()
+            add(filename, len(data), lambda: data)
+        else:
+            skipped.append(filename)
+    return uploads, skipped
+
+def analyze_batch_item(filename, resume_text, job_profile):
+    """Analyze one extracted resume; runs on the bounded analysis pool"""
+    if not resume_text.strip():
+        return {"filename": filename, "error": "Could not extract text from the resume"}
+    return analyze_resume_text(filename, resume_text, job_profile, priority=BATCH)
+
+def analyze_batch_full(extraction_pool, analysis_pool, uploads, job_profile):
+    """Full-mode batch: every extraction is queued on the process pool up front, and each text
+    moves to the bounded analysis pool as soon as it is extracted. Yields results in completion
+    order, not upload order"""
+    extracting = {
+        extraction_pool.submit(extract_text_from_upload, data, filename): filename
+        for filename, data in uploads
+    }
+    analyzing = {}
+    while extracting or analyzing:
+        done, _ = wait(set(extracting) | set(analyzing), return_when=FIRST_COMPLETED)
+        for future in done:
+            if future in extracting:
+                filename = extracting.pop(future)
+                try:
+                    resume_text = future.result()
+                except Exception as e:
+                    yield {"filename": filename, "error": f"An error occurred during extraction: {str(e)}"}
+                    continue
+                analyzing[analysis_pool.submit(analyze_batch_item, filename, resume_text, job_profile)] = filename
+                continue
+
+            filename = analyzing.pop(future)
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"filename": filename, "error": f"An error occurred during analysis: {str(e)}"}
+
+def analyze_batch_fast(extraction_pool, uploads, job_profile):
+    """Fast-mode batch: extraction in the process pool, then one batched local analysis pass"""
+    filenames = [filename for filename, _ in uploads]
+    texts = list(extraction_pool.map(extract_text_from_upload, [data for _, data in uploads], filenames))
+    extractions = iter(fast_extractions([text for text in texts if text.strip()]))
+    for filename, resume_text in zip(filenames, texts):
+        if not resume_text.strip():
+            yield {"filename": filename, "error": "Could not extract text from the resume"}
+            continue
+        analysis = score_extraction(next(extractions), job_profile)
+        yield build_analysis_response(filename, resume_text, job_profile, analysis)
+
+@api.route('/api/analyze-resumes', methods=['POST'])
+def analyze_resumes():
+    try:
+        files = request.files.getlist('resumes')
+        job_profile = request.form.get('job_profile', '')
+        mode = request.form.get('mode', 'full')
+
+        if not files:
+            return jsonify({"error": "No resume files provided"}), 400
+        if mode not in ANALYSIS_MODES:
+            return jsonify({"error": "mode must be 'full' or 'fast'"}), 400
+
+        uploads, skipped = collect_batch_uploads(files)
+        if not uploads:
+            return jsonify({"error": "No supported resume files found", "skipped": skipped}), 400
+    except BatchLimitError as e:
+        return jsonify({"error": str(e)}), e.status_code
+    except zipfile.BadZipFile:
+        return jsonify({"error": "Invalid zip archive"}), 400
+    except Exception as e:
+        return jsonify({"error": f"An error occurred during batch upload: {str(e)}"}), 500
+
+    extraction_pool, analysis_pool = get_batch_pools()
+
+    def generate():
+        for filename in skipped:
+            yield json.dumps({"filename": filename, "error": "File type not supported"}) + "\n"
+
+        if mode == 'fast':
+            for result in analyze_batch_fast(extraction_pool, uploads, job_profile):
+                yield json.dumps(result) + "\n"
+            return
+
+        for result in analyze_batch_full(extraction_pool, analysis_pool, uploads, job_profile):
+            yield json.dumps(result) + "\n"
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@api.route('/api/rank-profiles', methods=['POST'])
+def rank_profiles():
+    try:
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
+
+        file = request.files['resume']
+
+        if file.filename == '':
+            return jsonify({"error": "No file selected"}), 400
+
+        if not allowed_file(file.filename):
+            return jsonify({"error": "File type not supported. Please upload PDF, DOC, DOCX, or TXT files"}), 400
+
+        top = request.form.get('top', type=int)
+        filename = secure_filename(file.filename)
+        resume_text = extract_text_from_file(file.stream, filename)
+
+        if not resume_text.strip():
+            return jsonify({"error": "Could not extract text from the resume"}), 400
+
+        profiles = job_profiles()
+        rankings = [
+            {
+                "id": key,
+                "name": profiles[key]["name"],
+                "score": round(score, 1)
+            }
+            for key, score in profile_ranker.rank(keyword_matcher.find_terms(resume_text), top=top)
+            if key in profiles
+        ]
+
+        return jsonify({"filename": filename, "rankings": rankings})
+
+    except Exception as e:
+        return jsonify({"error": f"An error occurred during ranking: {str(e)}"}), 500
+
+@api.route('/api/candidates/search', methods=['GET'])
+def search_candidates():
+    try:
+        profile_key = request.args.get('profile', '')
+        skills = [skill for skill in request.args.get('skills', '').split(',') if skill.strip()]
+        min_years = request.args.get('min_years', type=float)
+        k = max(1, min(request.args.get('k', 10, type=int), 1000))
+
+        if profile_key:
+            profile = job_profiles().get(profile_key)
+            if profile is None:
+                return jsonify({"error": "Profile not found"}), 404
+            term_weights = profile_term_weights(profile)
+        else:
+            term_weights = {normalize_term(skill): 1.0 for skill in skills}
+
+        started = time.perf_counter()
+        candidate_index = get_candidate_index()
+        hits, total_matches = candidate_index.search(term_weights, min_years=min_years, k=k)
+        query_ms = (time.perf_counter() - started) * 1000
+
+        candidates = []
+        for candidate_id, score in hits:
+            record = candidate_index.get(candidate_id)
+            candidates.append({
+                "id": candidate_id,
+                "score": round(score, 2),
+                "filename": record["filename"],
+                "skills": record["skills"],
+                "education": record["education"],
+                "experience_years": record["experience_years"],
+                "summary": record["summary"]
+            })
+
+        return jsonify({
+            "candidates": candidates,
+            "total_matches": total_matches,
+            "query_ms": round(query_ms, 3)
+        })
+
+    except Exception as e:
+        return jsonify({"error": f"Error searching candidates: {str(e)}"}), 500
+
+def cached_extraction(resume_id):
+    return analysis_cache.get(cache_key_for_hash(resume_id))
+
+@api.route('/api/rescore', methods=['POST'])
+def rescore_resume():
+    try:
+        data = request.get_json()
+
+        if not data or 'resume_id' not in data or 'job_profile' not in data:
+            return jsonify({"error": "resume_id and job_profile are required"}), 400
+
+        profile = job_profiles().get(data['job_profile'])
+        if profile is None:
+            return jsonify({"error": "Profile not found"}), 404
+
+        extraction = cached_extraction(data['resume_id'])
+        if extraction is None:
+            return jsonify({"error": "Resume analysis not cached. Please upload the resume again."}), 404
+
+        analysis = score_extraction(extraction, data['job_profile'])
+        return jsonify({
+            "resume_id": data['resume_id'],
+            "job_profile": profile["name"],
+            "match_score": analysis["match_score"],
+            "match_details": analysis["match_details"],
+            "recommendations": analysis["recommendations"]
+        })
+
+    except Exception as e:
+        return jsonify({"error": f"Error re-scoring resume: {str(e)}"}), 500
+
+@api.route('/api/job-profiles/<profile_id>/rescore', methods=['POST'])
+def rescore_pool(profile_id):
+    try:
+        profile = job_profiles().get(profile_id)
+        if profile is None:
+            return jsonify({"error": "Profile not found"}), 404
+
+        data = request.get_json()
+        if not data or not isinstance(data.get('resume_ids'), list):
+            return jsonify({"error": "resume_ids list is required"}), 400
+
+        results = []
+        missing = []
+        for resume_id in data['resume_ids']:
+            extraction = cached_extraction(resume_id)
+            if extraction is None:
+                missing.append(resume_id)
+                continue
+            match_score, match_details = keyword_matcher.score_ngrams(
+                set(extraction.get("keyword_terms", [])), profile_id
+            )
+            results.append({"resume_id": resume_id, "match_score": match_score, "match_details": match_details})
+
+        results.sort(key=lambda result: result["match_score"], reverse=True)
+        return jsonify({"job_profile": profile["name"], "results": results, "missing": missing})
+
+    except Exception as e:
+        return jsonify({"error": f"Error re-scoring resumes: {str(e)}"}), 500
+
+def run_analysis_job(filename, data, job_profile, mode='full'):
+    """Background job body: extraction and analysis happen on a job worker, never a request thread"""
+    resume_text = extract_text_from_upload(data, filename)
+    if not resume_text.strip():
+        raise ValueError("Could not extract text from the resume")
+    return analyze_resume_text(filename, resume_text, job_profile, mode=mode)
+
+@api.route('/api/jobs', methods=['POST'])
+def submit_analysis_job():
+    try:
+        if 'resume' not in request.files:
+            return jsonify({"error": "No resume file provided"}), 400
+
+        file = request.files['resume']
+        job_profile = request.form.get('job_profile', '')
+        mode = request.form.get('mode', 'full')
+
+        if file.filename == '':
+            return jsonify({"error": "No file selected"}), 400
+
+        if mode not in ANALYSIS_MODES:
+            return jsonify({"error": "mode must be 'full' or 'fast'"}), 400
+
+        if not allowed_file(file.filename):
+            return jsonify({"error": "File type not supported. Please upload PDF, DOC, DOCX, or TXT files"}), 400
+
+        filename = secure_filename(file.filename)
+        job_id = get_job_queue().submit(
+            run_analysis_job, filename, file.read(), job_profile, mode,
+            meta={"filename": filename, "job_profile": job_profile, "mode": mode}
+        )
+
+        return jsonify({
+            "job_id": job_id,
+            "status": "queued",
+            "status_url": f"/api/jobs/{job_id}"
+        }), 202
+
+    except QueueFullError:
+        return jsonify({"error": "Analysis queue is full. Please try again shortly."}), 503
+    except Exception as e:
+        return jsonify({"error": f"Error submitting analysis job: {str(e)}"}), 500
+
+@api.route('/api/jobs/<job_id>', methods=['GET'])
+def get_analysis_job(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    job["job_id"] = job_id
+    return jsonify(job)
+
+def warm_up():
+    """Import the lazily loaded libraries and create the Gemini client ahead of the first analysis"""
+    started = time.perf_counter()
+    try:
+        import docx  # noqa: F401
+        import PyPDF2  # noqa: F401
+        gemini_scheduler.model
+    except Exception as e:
+        print(f"Error warming up: {e}")
+        return
+    metrics.record_stage("warm_up", time.perf_counter() - started)
+
+def create_app():
+    """Build the Flask app.
+
+    Nothing slow happens here: the Gemini client and file parsers are created on first use,
+    and persisted profiles and the warm-up load on background threads, so /api/health answers
+    right away. Pre-fork servers should call it in each worker (e.g. gunicorn 'app:create_app()'
+    without --preload) so those threads and the model client's connections belong to the worker.
+    """
+    app = Flask(__name__)
+    app.request_class = SpooledUploadRequest
+    app.config['MAX_CONTENT_LENGTH'] = MAX_CONTENT_LENGTH
+    CORS(app)
+    app.register_blueprint(api)
+
+    # Persisted profiles are read in the background so startup does not wait on the database
+    threading.Thread(target=profile_store.load, daemon=True).start()
+    if APP_WARM_UP:
+        threading.Thread(target=warm_up, daemon=True).start()
+    return app
+
+_default_app = None
+_default_app_lock = threading.Lock()
+
+def get_app():
+    """The process's app for `python app.py`, asgi.py and the benchmarks, created on first access"""
+    global _default_app
+    with _default_app_lock:
+        if _default_app is None:
+            _default_app = create_app()
+    return _default_app
+
+def __getattr__(name):
+    # `app.app` (gunicorn app:app, older scripts) resolves to the lazily created default app
+    if name == 'app':
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 if __name__ == '__main__':
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    create_app().run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,200 @@
+"""ASGI serving mode.
+
+/api/health, /api/job-profiles and /api/analyze-resume are served natively on asyncio: model
+calls go through the shared scheduler with generate_content_async, and text extraction and other
+CPU-bound steps run on a thread pool, so an analysis waiting on Gemini holds a coroutine rather
+than an OS thread. Every other route is served by the Flask app, mounted behind them. app.py is
+unchanged and still runs under WSGI on its own.
+
+Like create_app(), importing this module does not load the Gemini SDK or the file parsers.
+
+    cd backend && uvicorn asgi:app --host 0.0.0.0 --port 5000
+"""
+import asyncio
+import contextlib
+import contextvars
+import functools
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+from werkzeug.utils import secure_filename
+
+import app as service
+from gemini_scheduler import INTERACTIVE
+from metrics import server_timing
+
+# Text extraction, scoring and index writes run on this pool; long PDFs are further split
+# across the PDF process pool
+ASGI_EXECUTOR_WORKERS = int(os.getenv('ASGI_EXECUTOR_WORKERS', str(os.cpu_count() or 2)))
+# Threads for the Flask routes that are not served natively
+ASGI_WSGI_WORKERS = int(os.getenv('ASGI_WSGI_WORKERS', '16'))
+
+executor = ThreadPoolExecutor(max_workers=ASGI_EXECUTOR_WORKERS)
+metrics = service.metrics
+
+
+async def run_blocking(fn, *args):
+    """Run fn on the executor; stage timings it records still count towards the current request"""
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(executor, functools.partial(context.run, fn, *args))
+
+
+def timed(handler):
+    """Request latency, counters and the optional Server-Timing header, as the Flask hooks record them"""
+    @functools.wraps(handler)
+    async def wrapper(request):
+        started = time.perf_counter()
+        token = metrics.start_request()
+        try:
+            response = await handler(request)
+        finally:
+            stages = metrics.finish_request(token)
+        elapsed = time.perf_counter() - started
+        endpoint = request.url.path
+        metrics.observe("http_request_seconds", elapsed, endpoint=endpoint, method=request.method)
+        metrics.increment("http_requests_total", endpoint=endpoint, method=request.method, status=str(response.status_code))
+        if service.METRICS_TIMING_HEADERS:
+            response.headers["Server-Timing"] = server_timing(stages + [("total", elapsed)])
+        return response
+    return wrapper
+
+
+async def analyze_resume_with_gemini(resume_text, priority=INTERACTIVE):
+    """service.analyze_resume_with_gemini without blocking the event loop on the model call"""
+    with metrics.span("build_prompt"):
+        prompt, prompt_stats = service.build_analysis_prompt(resume_text)
+
+    try:
+        with metrics.span("gemini_call"):
+            response = await service.gemini_scheduler.generate_async(prompt, priority=priority, **service.ANALYSIS_OUTPUT)
+    except Exception as e:
+        return await run_blocking(service.gemini_error_analysis, resume_text, e)
+    return await run_blocking(service.parse_analysis_response, resume_text, response, prompt_stats)
+
+
+async def analyze_resume_text(filename, resume_text, job_profile, mode='full'):
+    if mode == 'fast':
+        return await run_blocking(service.analyze_resume_fast, filename, resume_text, job_profile)
+
+    extraction, signature = await run_blocking(service.lookup_extraction, resume_text)
+    if extraction is None:
+        extraction = await analyze_resume_with_gemini(resume_text)
+        extraction = await run_blocking(service.store_extraction, resume_text, extraction, signature)
+    return await run_blocking(service.finish_analysis, filename, resume_text, job_profile, extraction)
+
+
+async def generate_job_profile_with_gemini(job_role):
+    try:
+        with metrics.span("profile_gemini_call"):
+            response = await service.gemini_scheduler.generate_async(
+                service.job_profile_prompt(job_role), **service.JOB_PROFILE_OUTPUT
+            )
+    except Exception as e:
+        print(f"Error generating profile with Gemini: {e}")
+        return service.empty_generated_profile()
+    return service.parse_job_profile_response(response)
+
+
+@timed
+async def health_check(request):
+    return JSONResponse({"status": "healthy", "message": "Resume Analysis API is running"})
+
+
+@timed
+async def get_job_profiles(request):
+    return JSONResponse(service.job_profile_list())
+
+
+@timed
+async def create_job_profile(request):
+    try:
+        try:
+            data = await request.json()
+        except ValueError:
+            data = None
+        profile_id, error = service.new_profile_id(data)
+        if error:
+            return JSONResponse({"error": error}, status_code=400)
+
+        # Shares in-flight generations with the WSGI routes as well as other coroutines
+        gemini_profile = await service.profile_store.generate_async(data['name'], generate_job_profile_with_gemini)
+        new_profile = service.build_job_profile(data['name'], gemini_profile)
+
+        if not await run_blocking(service.profile_store.add, profile_id, new_profile):
+            return JSONResponse({"error": "Profile with this name already exists"}, status_code=400)
+
+        return JSONResponse({
+            "id": profile_id,
+            "name": new_profile["name"],
+            "message": "Profile created successfully with AI-generated skills"
+        }, status_code=201)
+
+    except Exception as e:
+        return JSONResponse({"error": f"Error creating profile: {str(e)}"}, status_code=500)
+
+
+@timed
+async def analyze_resume(request):
+    try:
+        if int(request.headers.get('content-length') or 0) > service.MAX_CONTENT_LENGTH:
+            return JSONResponse({"error": "File too large"}, status_code=413)
+
+        form = await request.form()
+        upload = form.get('resume')
+        if upload is None or isinstance(upload, str):
+            return JSONResponse({"error": "No resume file provided"}, status_code=400)
+
+        job_profile = form.get('job_profile', '')
+        mode = form.get('mode', 'full')
+
+        error = service.upload_error(upload.filename or '', mode)
+        if error:
+            return JSONResponse({"error": error}, status_code=400)
+
+        filename = secure_filename(upload.filename)
+
+        # Starlette spools the upload like the WSGI app does; extraction reads it off the loop
+        with metrics.span("extract_text"):
+            resume_text, extraction_stats = await run_blocking(service.extract_text_with_stats, upload.file, filename)
+
+        if not resume_text.strip():
+            return JSONResponse({"error": "Could not extract text from the resume"}, status_code=400)
+
+        analysis_result = await analyze_resume_text(filename, resume_text, job_profile, mode)
+        if extraction_stats:
+            analysis_result["extraction_stats"] = extraction_stats
+
+        return JSONResponse(analysis_result)
+
+    except Exception as e:
+        return JSONResponse({"error": f"An error occurred during analysis: {str(e)}"}, status_code=500)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    yield
+    executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health_check, methods=['GET']),
+        Route('/api/job-profiles', get_job_profiles, methods=['GET']),
+        Route('/api/job-profiles', create_job_profile, methods=['POST']),
+        Route('/api/analyze-resume', analyze_resume, methods=['POST']),
+        Mount('/', app=WSGIMiddleware(service.get_app(), workers=ASGI_WSGI_WORKERS))
+    ],
+    middleware=[Middleware(CORSMiddleware, allow_origins=['*'], allow_methods=['*'], allow_headers=['*'])],
+    lifespan=lifespan
+)
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
@@ -0,0 +1,123 @@
+"""Local stand-in for genai.GenerativeModel with injectable latency, 429 rate and malformed-JSON rate."""
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+
+from benchmarks.resume_corpus import SKILLS
+
+_EMAIL = re.compile(r'[\w.+-]+@[\w-]+\.[\w.]+')
+_YEARS = re.compile(r'(\d+) years of experience')
+
+
+class _Part:
+    def __init__(self, text):
+        self.text = text
+
+
+class _Content:
+    def __init__(self, text):
+        self.parts = [_Part(text)]
+
+
+class _Candidate:
+    def __init__(self, text):
+        self.content = _Content(text)
+
+
+class FakeResponse:
+    """Just enough of a GenerateContentResponse for response_text_of()"""
+
+    def __init__(self, text):
+        self.text = text
+        self.candidates = [_Candidate(text)]
+
+
+class FakeGenerativeModel:
+    """Answers analysis and job-profile prompts with plausible JSON after a simulated delay.
+
+    latency is the mean seconds per call (jitter is +/- that fraction of it). rate_limit_rate
+    and malformed_rate are the fractions of calls that raise a 429 or return truncated JSON.
+    """
+
+    def __init__(self, latency=0.8, jitter=0.25, rate_limit_rate=0.0, malformed_rate=0.0,
+                 retry_delay=1, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limit_rate = rate_limit_rate
+        self.malformed_rate = malformed_rate
+        self.retry_delay = retry_delay
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"calls": 0, "rate_limited": 0, "malformed": 0, "seconds": 0.0}
+
+    def _draw(self):
+        with self._lock:
+            delay = max(0.0, self.latency * (1 + self._random.uniform(-self.jitter, self.jitter)))
+            rate_limited = self._random.random() < self.rate_limit_rate
+            malformed = not rate_limited and self._random.random() < self.malformed_rate
+            self.stats["calls"] += 1
+            self.stats["rate_limited"] += rate_limited
+            self.stats["malformed"] += malformed
+            self.stats["seconds"] += delay
+        return delay, rate_limited, malformed
+
+    def _answer(self, prompt):
+        if "job role" in prompt:
+            words = self._random.sample(SKILLS, 16)
+            return {
+                "required_skills": words[:10],
+                "preferred_skills": words[10:],
+                "experience_keywords": ["developed", "built", "led", "launched", "optimized", "designed"],
+                "education_keywords": ["computer science", "engineering", "business administration", "statistics"]
+            }
+        lowered = prompt.lower()
+        skills = [skill for skill in SKILLS if skill in lowered]
+        years = _YEARS.search(prompt)
+        return {
+            "contact_info": {"emails": _EMAIL.findall(prompt)[:1], "phones": [], "linkedin": []},
+            "skills": skills,
+            "experience_years": int(years.group(1)) if years else 0,
+            "education": ["Bachelor of Science"],
+            "recommendations": ["Quantify the impact of recent projects."],
+            "summary": f"Candidate with {len(skills)} listed skills.",
+            "resume_description": "Synthetic benchmark resume.",
+            "general_thoughts": "Generated by the fake Gemini backend."
+        }
+
+    def _rate_limit_error(self):
+        return Exception(f"429 Resource has been exhausted (e.g. check quota). retry_delay {{ seconds: {self.retry_delay} }}")
+
+    def _text(self, prompt, malformed):
+        text = json.dumps(self._answer(prompt))
+        if malformed:
+            text = text[:len(text) // 2]
+        return f"```json\n{text}\n```"
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        delay, rate_limited, malformed = self._draw()
+        if rate_limited:
+            time.sleep(min(delay, 0.05))
+            raise self._rate_limit_error()
+
+        text = self._text(prompt, malformed)
+        if not stream:
+            time.sleep(delay)
+            return FakeResponse(text)
+        return self._stream(text, delay)
+
+    async def generate_content_async(self, prompt, **kwargs):
+        delay, rate_limited, malformed = self._draw()
+        if rate_limited:
+            await asyncio.sleep(min(delay, 0.05))
+            raise self._rate_limit_error()
+        await asyncio.sleep(delay)
+        return FakeResponse(self._text(prompt, malformed))
+
+    def _stream(self, text, delay, chunks=8):
+        size = max(1, -(-len(text) // chunks))
+        for start in range(0, len(text), size):
+            time.sleep(delay / chunks)
+            yield FakeResponse(text[start:start + size])
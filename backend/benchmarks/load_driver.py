@@ -0,0 +1,281 @@
+"""Load driver for the resume analysis API.
+
+Runs each stage (a fixed request mix against one endpoint) at the given concurrency and reports
+p50/p95/p99 latency and requests/sec. By default the Flask app is loaded in-process with the
+fake Gemini backend, so no API quota is used; --url targets a running server instead. Results
+are saved as JSON and can be compared with an earlier run to catch regressions.
+
+    cd backend && python -m benchmarks.load_driver --requests 60 --concurrency 8 --compare latest
+"""
+import argparse
+import glob
+import io
+import json
+import math
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.fake_gemini import FakeGenerativeModel
+from benchmarks.resume_corpus import generate_corpus
+
+STAGES = ("job-profiles:list", "job-profiles:create", "analyze-resume", "analyze-resume:cached", "analyze-resume:fast")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class InProcessClient:
+    """Flask test client for the app imported in this process"""
+
+    def __init__(self, app):
+        self._client = app.test_client()
+
+    def get(self, path):
+        response = self._client.get(path)
+        return response.status_code, response.get_json(silent=True)
+
+    def post_json(self, path, payload):
+        response = self._client.post(path, json=payload)
+        return response.status_code, response.get_json(silent=True)
+
+    def post_file(self, path, field, filename, data, form=None):
+        response = self._client.post(
+            path, data=dict(form or {}, **{field: (io.BytesIO(data), filename)}), content_type='multipart/form-data'
+        )
+        return response.status_code, response.get_json(silent=True)
+
+    def delete(self, path):
+        return self._client.delete(path).status_code, None
+
+
+class HttpClient:
+    """requests-based client for a server started separately"""
+
+    def __init__(self, base_url):
+        import requests
+        self._session = requests.Session()
+        self._base_url = base_url.rstrip('/')
+
+    @staticmethod
+    def _result(response):
+        try:
+            return response.status_code, response.json()
+        except ValueError:
+            return response.status_code, None
+
+    def get(self, path):
+        return self._result(self._session.get(self._base_url + path))
+
+    def post_json(self, path, payload):
+        return self._result(self._session.post(self._base_url + path, json=payload))
+
+    def post_file(self, path, field, filename, data, form=None):
+        return self._result(self._session.post(self._base_url + path, data=form or {}, files={field: (filename, data)}))
+
+    def delete(self, path):
+        return self._session.delete(self._base_url + path).status_code, None
+
+
+def load_app(args):
+    """Import the app against throwaway state with the fake model behind the scheduler"""
+    state_dir = tempfile.mkdtemp(prefix="resume-bench-")
+    os.environ.setdefault("CANDIDATE_INDEX_DIR", os.path.join(state_dir, "candidate_index"))
+    os.environ.setdefault("JOB_PROFILE_STORE_PATH", "")
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    # The real scheduler still runs; its rate limits are off unless asked for
+    os.environ.setdefault("GEMINI_RPM", str(args.rpm))
+    os.environ.setdefault("GEMINI_TPM", "0")
+    # The fake model replaces the real client, so there is nothing to warm up
+    os.environ.setdefault("APP_WARM_UP", "0")
+
+    import app as service
+    fake_model = FakeGenerativeModel(
+        latency=args.latency, jitter=args.jitter, rate_limit_rate=args.rate_limit_rate,
+        malformed_rate=args.malformed_rate, retry_delay=args.retry_delay, seed=args.seed
+    )
+    service.gemini_scheduler.model = fake_model
+    return service.create_app(), fake_model
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    # Nearest rank
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_stage(name, make_client, calls, concurrency):
+    """Run the stage's calls on `concurrency` threads; each call returns (status, body)"""
+    clients = {}
+
+    def timed(call):
+        client = clients.get(threading.get_ident())
+        if client is None:
+            client = clients[threading.get_ident()] = make_client()
+        started = time.perf_counter()
+        try:
+            status, _ = call(client)
+        except Exception as e:
+            print(f"[{name}] request failed: {e}", file=sys.stderr)
+            status = None
+        return time.perf_counter() - started, status
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(timed, calls))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(seconds * 1000 for seconds, _ in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    errors = sum(count for status, count in statuses.items() if status == "None" or int(status) >= 400)
+    return {
+        "requests": len(results),
+        "concurrency": concurrency,
+        "errors": errors,
+        "statuses": statuses,
+        "requests_per_second": round(len(results) / wall, 2) if wall else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "mean_ms": round(sum(latencies) / len(latencies), 2) if latencies else 0.0,
+        "max_ms": round(latencies[-1], 2) if latencies else 0.0,
+        "wall_seconds": round(wall, 3)
+    }
+
+
+def stage_calls(stage, corpus, count, run_id, job_profile):
+    form = {"job_profile": job_profile} if job_profile else {}
+    if stage == "job-profiles:list":
+        return [lambda client: client.get('/api/job-profiles')] * count
+    if stage == "job-profiles:create":
+        return [
+            (lambda client, i=i: client.post_json('/api/job-profiles', {"name": f"Bench {run_id} Role {i}"}))
+            for i in range(count)
+        ]
+    if stage in ("analyze-resume", "analyze-resume:cached", "analyze-resume:fast"):
+        if stage == "analyze-resume:fast":
+            form = dict(form, mode="fast")
+        return [
+            (lambda client, item=corpus[i % len(corpus)]: client.post_file(
+                '/api/analyze-resume', 'resume', item[0], item[1], form))
+            for i in range(count)
+        ]
+    raise ValueError(f"Unknown stage {stage}")
+
+
+def cleanup_profiles(client, run_id):
+    status, profiles = client.get('/api/job-profiles')
+    for profile in profiles or []:
+        if profile["name"].startswith(f"Bench {run_id} "):
+            client.delete(f"/api/job-profiles/{profile['id']}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def latest_result():
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")))
+    return paths[-1] if paths else None
+
+
+def compare(previous, current, tolerance):
+    """Print per-stage changes; returns the stages whose p95 or throughput regressed beyond tolerance"""
+    regressions = []
+    print(f"\nCompared with {previous.get('created_at')} ({previous.get('git_commit') or 'unknown commit'}):")
+    for stage, now in current["stages"].items():
+        before = previous.get("stages", {}).get(stage)
+        if not before:
+            continue
+        changes = []
+        for metric in ("p50_ms", "p95_ms", "p99_ms", "requests_per_second"):
+            if before[metric]:
+                changes.append((metric, (now[metric] - before[metric]) / before[metric]))
+        print(f"  {stage:24s} " + "  ".join(f"{metric} {change:+.1%}" for metric, change in changes))
+        change = dict(changes)
+        if change.get("p95_ms", 0) > tolerance or change.get("requests_per_second", 0) < -tolerance:
+            regressions.append(stage)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="benchmark a running server instead of the in-process app")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--requests", type=int, default=40, help="requests per stage")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--job-profile", default="software_engineer")
+    parser.add_argument("--formats", default="txt,docx,pdf")
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.8, help="fake model mean seconds per call")
+    parser.add_argument("--jitter", type=float, default=0.25)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--retry-delay", type=int, default=1)
+    parser.add_argument("--rpm", type=int, default=0, help="scheduler requests per minute (0 = unlimited)")
+    parser.add_argument("--save", default=None, help="result file (default: results/<timestamp>.json)")
+    parser.add_argument("--compare", default=None, help="earlier result file, or 'latest'")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed p95/throughput change")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    previous_path = latest_result() if args.compare == "latest" else args.compare
+    fake_model = None
+    if args.url:
+        make_client = lambda: HttpClient(args.url)
+    else:
+        app, fake_model = load_app(args)
+        make_client = lambda: InProcessClient(app)
+
+    run_id = uuid.uuid4().hex[:6]
+    corpus = generate_corpus(args.requests, tuple(args.formats.split(",")), args.words, args.pages, args.seed)
+    results = {}
+    for stage in args.stages.split(","):
+        results[stage] = run_stage(
+            stage, make_client, stage_calls(stage, corpus, args.requests, run_id, args.job_profile), args.concurrency
+        )
+        summary = results[stage]
+        print(
+            f"{stage:24s} {summary['requests_per_second']:8.2f} req/s  p50 {summary['p50_ms']:8.1f} ms  "
+            f"p95 {summary['p95_ms']:8.1f} ms  p99 {summary['p99_ms']:8.1f} ms  errors {summary['errors']}"
+        )
+    cleanup_profiles(make_client(), run_id)
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "config": vars(args),
+        "fake_model": fake_model.stats if fake_model else None,
+        "stages": results
+    }
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    save_path = args.save or os.path.join(RESULTS_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(save_path, 'w', encoding='utf-8') as file:
+        json.dump(report, file, indent=2)
+    print(f"\nSaved results to {save_path}")
+
+    if previous_path:
+        with open(previous_path, 'r', encoding='utf-8') as file:
+            regressions = compare(json.load(file), report, args.tolerance)
+        if regressions:
+            print(f"Regressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            if args.fail_on_regression:
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Synthetic resume corpus for benchmarks: TXT, DOCX and PDF files of configurable size and page count."""
+import argparse
+import io
+import os
+import random
+
+import docx
+
+FIRST_NAMES = ["Aarav", "Maya", "Jordan", "Priya", "Lucas", "Amara", "Chen", "Sofia", "Noah", "Fatima", "Ethan", "Leila"]
+LAST_NAMES = ["Sharma", "Okafor", "Nguyen", "Garcia", "Kim", "Patel", "Smith", "Rossi", "Haddad", "Novak", "Silva"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella Labs", "Stark Industries", "Wayne Analytics", "Hooli", "Vandelay"]
+TITLES = ["Software Engineer", "Data Scientist", "Marketing Manager", "Backend Developer", "ML Engineer", "Product Analyst"]
+SKILLS = [
+    "python", "java", "javascript", "react", "node.js", "sql", "git", "docker", "kubernetes", "aws", "ci/cd",
+    "machine learning", "statistics", "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "spark",
+    "tableau", "seo", "social media", "content marketing", "google ads", "crm", "agile", "scrum", "testing"
+]
+VERBS = ["developed", "built", "implemented", "designed", "analyzed", "launched", "optimized", "managed", "led", "modeled"]
+OBJECTS = [
+    "a payments API", "the data pipeline", "customer dashboards", "a recommendation model", "the CI/CD workflow",
+    "an onboarding campaign", "internal tooling", "the search service", "A/B testing infrastructure", "reporting jobs"
+]
+DEGREES = [
+    "Bachelor of Science in Computer Science", "Master of Science in Data Science",
+    "Bachelor of Business Administration in Marketing", "Bachelor of Engineering in Information Technology"
+]
+FORMATS = ("txt", "docx", "pdf")
+
+
+def resume_pages(rng, words=500, pages=1):
+    """Lines of a synthetic resume split into pages, roughly `words` words in total"""
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    header = [
+        name,
+        f"{name.lower().replace(' ', '.')}@example.com | +1 555-{rng.randint(100, 999)}-{rng.randint(1000, 9999)}"
+        f" | linkedin.com/in/{name.lower().replace(' ', '')}{rng.randint(1, 999)}",
+        "",
+        "Summary",
+        f"{rng.choice(TITLES)} with {rng.randint(1, 15)} years of experience delivering data-driven products.",
+        "",
+        "Skills",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 14))),
+        "",
+        "Education",
+        f"{rng.choice(DEGREES)}, {rng.randint(2000, 2020)}",
+        "",
+        "Experience"
+    ]
+    body = []
+    count = sum(len(line.split()) for line in header)
+    year = 2024
+    while count < words:
+        start = year - rng.randint(1, 4)
+        body.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} {start} - {year}")
+        year = start
+        for _ in range(rng.randint(3, 6)):
+            bullet = (
+                f"- {rng.choice(VERBS).capitalize()} {rng.choice(OBJECTS)} using "
+                f"{rng.choice(SKILLS)} and {rng.choice(SKILLS)}, improving throughput by {rng.randint(5, 80)}%"
+            )
+            body.append(bullet)
+            count += len(bullet.split())
+        body.append("")
+
+    lines = header + body
+    per_page = max(1, -(-len(lines) // max(1, pages)))
+    return [lines[i:i + per_page] for i in range(0, len(lines), per_page)][:max(1, pages)] or [[]]
+
+
+def _pdf_escape(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)').encode('latin-1', 'replace')
+
+
+def render_pdf(pages):
+    """Minimal multi-page PDF with one Helvetica text stream per page"""
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for lines in pages:
+        content = b"BT /F1 9 Tf 40 800 Td 11 TL " + b"".join(b"(" + _pdf_escape(line) + b") '" for line in lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(output)
+    output += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    output += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    output += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(output)
+
+
+def render_docx(pages):
+    document = docx.Document()
+    for index, lines in enumerate(pages):
+        if index:
+            document.add_page_break()
+        for line in lines:
+            document.add_paragraph(line)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def render_txt(pages):
+    return "\f".join("\n".join(lines) for lines in pages).encode('utf-8')
+
+
+RENDERERS = {"txt": render_txt, "docx": render_docx, "pdf": render_pdf}
+
+
+def generate_corpus(count, formats=FORMATS, words=500, pages=1, seed=0):
+    """List of (filename, bytes) resumes; every resume has distinct text so caches do not hide the work"""
+    rng = random.Random(seed)
+    corpus = []
+    for index in range(count):
+        extension = formats[index % len(formats)]
+        corpus.append((f"resume_{index:05d}.{extension}", RENDERERS[extension](resume_pages(rng, words, pages))))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=30)
+    parser.add_argument("--formats", default=",".join(FORMATS), help="comma-separated subset of txt,docx,pdf")
+    parser.add_argument("--words", type=int, default=500)
+    parser.add_argument("--pages", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmarks/corpus")
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+    corpus = generate_corpus(args.count, tuple(args.formats.split(",")), args.words, args.pages, args.seed)
+    for filename, data in corpus:
+        with open(os.path.join(args.out, filename), 'wb') as file:
+            file.write(data)
+    print(f"Wrote {len(corpus)} resumes to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
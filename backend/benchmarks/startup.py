@@ -0,0 +1,151 @@
+"""Startup benchmark: time from a fresh interpreter to the first /api/health response.
+
+Each run starts a new Python process that imports app.py, calls create_app() and requests
+/api/health through the Flask test client, reporting how long each step took. The totals
+include interpreter startup as seen from this process. --command starts a real server instead
+(e.g. gunicorn or uvicorn) and polls --url until /api/health answers, which is what an
+autoscaler's readiness check waits for.
+
+    cd backend && python -m benchmarks.startup --runs 5
+    cd backend && python -m benchmarks.startup --command "gunicorn -w 2 -b 127.0.0.1:5001 'app:create_app()'" --url http://127.0.0.1:5001
+"""
+import argparse
+import json
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PHASES = ("import", "create_app", "first_health", "total")
+# Modules app.py loads on first use; listed in the report if something imported them at startup
+LAZY_MODULES = ("google.generativeai", "grpc", "docx", "PyPDF2", "scipy", "spacy")
+
+
+def child():
+    """Runs in the fresh interpreter; prints per-phase seconds as JSON"""
+    started = time.perf_counter()
+    sys.path.insert(0, BACKEND_DIR)
+    import app as service
+    imported = time.perf_counter()
+    flask_app = service.create_app()
+    created = time.perf_counter()
+    response = flask_app.test_client().get('/api/health')
+    answered = time.perf_counter()
+    print(json.dumps({
+        "status": response.status_code,
+        "import": imported - started,
+        "create_app": created - imported,
+        "first_health": answered - created,
+        "loaded": [name for name in LAZY_MODULES if name in sys.modules]
+    }))
+
+
+def child_env(args):
+    """Throwaway state, so runs neither share nor touch the real index and profile store"""
+    state_dir = tempfile.mkdtemp(prefix="resume-startup-")
+    env = dict(os.environ)
+    env.setdefault("CANDIDATE_INDEX_DIR", os.path.join(state_dir, "candidate_index"))
+    env.setdefault("JOB_PROFILE_STORE_PATH", "")
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    if args.no_warm_up:
+        env["APP_WARM_UP"] = "0"
+    return env
+
+
+def run_in_process(args):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.startup", "--child"],
+        cwd=BACKEND_DIR, env=child_env(args), capture_output=True, text=True, timeout=args.timeout
+    )
+    total = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "child failed")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    if report["status"] != 200:
+        raise RuntimeError(f"/api/health returned {report['status']}")
+    report["total"] = total
+    return report
+
+
+def wait_for_health(url, deadline):
+    while time.perf_counter() < deadline:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.01)
+    raise RuntimeError(f"{url} did not answer within the timeout")
+
+
+def run_server(args):
+    health_url = args.url.rstrip('/') + '/api/health'
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        shlex.split(args.command), cwd=BACKEND_DIR, env=child_env(args),
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_for_health(health_url, started + args.timeout)
+        return {"total": time.perf_counter() - started}
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--command", help="start this server instead of the in-process app")
+    parser.add_argument("--url", default="http://127.0.0.1:5000", help="base URL the --command server listens on")
+    parser.add_argument("--no-warm-up", action="store_true", help="run with APP_WARM_UP=0")
+    parser.add_argument("--timeout", type=float, default=60.0, help="seconds to wait for each run")
+    parser.add_argument("--save", default=None, help="write the report as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    runs = []
+    for index in range(args.runs):
+        run = run_server(args) if args.command else run_in_process(args)
+        runs.append(run)
+        print(f"run {index + 1}: " + "  ".join(f"{phase} {run[phase] * 1000:.0f}ms" for phase in PHASES if phase in run))
+
+    summary = {
+        phase: {
+            "median_ms": round(statistics.median(run[phase] for run in runs) * 1000, 1),
+            "max_ms": round(max(run[phase] for run in runs) * 1000, 1)
+        }
+        for phase in PHASES if phase in runs[0]
+    }
+    print()
+    for phase, stats in summary.items():
+        print(f"{phase:14s} median {stats['median_ms']:8.1f}ms  max {stats['max_ms']:8.1f}ms")
+    loaded = sorted({name for run in runs for name in run.get("loaded", [])})
+    if loaded:
+        # With warm-up on, its background imports may already be under way at this point
+        print(f"Imported before the first /api/health: {', '.join(loaded)}")
+
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump({"command": args.command, "runs": runs, "summary": summary}, file, indent=2)
+        print(f"Saved results to {args.save}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,336 @@
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # no flock on Windows; only one process may then write to an index directory
+    fcntl = None
+
+from keyword_matcher import normalize_term
+
+MANIFEST_FILE = 'manifest.json'
+LOG_FILE = 'candidates.jsonl'
+LOCK_FILE = 'index.lock'
+
+
+def _experience_value(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _hash_value(text_hash):
+    return int(text_hash[:16], 16)
+
+
+class CandidateIndex:
+    """Searchable index of analyzed candidates.
+
+    Candidate records are appended to a JSON-lines log. Compacted segments hold an
+    inverted index (skill -> sorted candidate ids) and per-candidate numeric arrays as
+    .npy files that are memory-mapped on load, so startup does not read them into RAM.
+    Candidates added since the last compaction live in a small in-memory delta.
+
+    Several processes (e.g. server workers) can share a directory: writers hold an exclusive
+    flock on index.lock, and every operation first picks up compactions and log entries
+    written by other processes, so candidate ids come from the shared log, not local counters.
+    """
+
+    def __init__(self, directory, compact_every=500):
+        self.directory = directory
+        self.compact_every = compact_every
+        self._lock = threading.RLock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    def _path(self, *names):
+        return os.path.join(self.directory, *names)
+
+    @contextmanager
+    def _file_lock(self, exclusive=False):
+        """flock across processes; opened per use so forked workers never share a lock"""
+        if fcntl is None:
+            yield
+            return
+        with open(self._path(LOCK_FILE), 'a+b') as handle:
+            fcntl.flock(handle, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _manifest_version(self):
+        try:
+            stat = os.stat(self._path(MANIFEST_FILE))
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self):
+        """Catch up with compactions and candidates written by other processes"""
+        if self._manifest_version() != self._manifest_seen:
+            self._load_manifest()
+        else:
+            self._read_log_tail()
+
+    def _load(self):
+        with self._file_lock():
+            self._load_manifest()
+
+    def _load_manifest(self):
+        self._manifest_seen = self._manifest_version()
+        try:
+            with open(self._path(MANIFEST_FILE), 'r', encoding='utf-8') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            manifest = {"segment": None, "count": 0, "log_bytes": 0, "terms": {}}
+
+        self._segment = manifest["segment"]
+        self._base_count = manifest["count"]
+        self._base_terms = manifest["terms"]
+        if self._segment:
+            load = lambda name: np.load(self._path(self._segment, name), mmap_mode='r')
+            self._postings = load('postings.npy')
+            self._experience = load('experience.npy')
+            self._experience_order = load('experience_order.npy')
+            self._experience_sorted = load('experience_sorted.npy')
+            self._offsets = load('offsets.npy')
+            self._hashes = load('hashes.npy')
+        else:
+            self._postings = np.empty(0, dtype=np.int32)
+            self._experience = np.empty(0, dtype=np.float32)
+            self._experience_order = np.empty(0, dtype=np.int32)
+            self._experience_sorted = np.empty(0, dtype=np.float32)
+            self._offsets = np.empty(0, dtype=np.int64)
+            self._hashes = np.empty(0, dtype=np.uint64)
+
+        self._delta_postings = {}
+        self._delta_records = []
+        self._delta_offsets = []
+        self._hash_ids = None
+
+        # Replay candidates logged after the last compaction
+        self._log_bytes = manifest["log_bytes"]
+        self._read_log_tail()
+
+    def _read_log_tail(self):
+        try:
+            if os.path.getsize(self._path(LOG_FILE)) <= self._log_bytes:
+                return
+        except OSError:
+            return
+        with open(self._path(LOG_FILE), 'rb') as log:
+            log.seek(self._log_bytes)
+            for line in log:
+                if not line.endswith(b'\n'):
+                    break
+                self._add_to_delta(json.loads(line), self._log_bytes)
+                self._log_bytes += len(line)
+
+    def __len__(self):
+        return self._base_count + len(self._delta_records)
+
+    def _add_to_delta(self, record, offset):
+        candidate_id = record["id"]
+        for term in record["terms"]:
+            self._delta_postings.setdefault(term, []).append(candidate_id)
+        self._delta_records.append(record)
+        self._delta_offsets.append(offset)
+        if self._hash_ids is not None:
+            self._hash_ids[_hash_value(record["hash"])] = candidate_id
+
+    def add(self, text_hash, filename, analysis, terms=(), job_profile=''):
+        """Index one analyzed resume; re-adding the same resume text is a no-op"""
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            if self._hash_ids is None:
+                # Built on first write only, so read-only startups never touch the hash array
+                self._hash_ids = {int(value): i for i, value in enumerate(self._hashes)}
+                for record in self._delta_records:
+                    self._hash_ids[_hash_value(record["hash"])] = record["id"]
+            existing = self._hash_ids.get(_hash_value(text_hash))
+            if existing is not None:
+                return existing
+
+            indexed_terms = set(terms)
+            indexed_terms.update(normalize_term(skill) for skill in analysis.get("skills", []) if skill)
+            indexed_terms.update(normalize_term(entry) for entry in analysis.get("education", []) if entry)
+            indexed_terms.discard('')
+
+            record = {
+                "id": len(self),
+                "hash": text_hash,
+                "filename": filename,
+                "job_profile": job_profile,
+                "skills": analysis.get("skills", []),
+                "education": analysis.get("education", []),
+                "experience_years": _experience_value(analysis.get("experience_years", 0)),
+                "summary": analysis.get("summary", ""),
+                "terms": sorted(indexed_terms),
+                "added_at": time.time()
+            }
+            line = (json.dumps(record) + "\n").encode('utf-8')
+            with open(self._path(LOG_FILE), 'ab') as log:
+                log.write(line)
+            offset = self._log_bytes
+            self._log_bytes += len(line)
+            self._add_to_delta(record, offset)
+
+            if len(self._delta_records) >= self.compact_every:
+                self._compact()
+            return record["id"]
+
+    def compact(self):
+        """Merge the in-memory delta into a new memory-mapped segment"""
+        with self._lock, self._file_lock(exclusive=True):
+            self._refresh()
+            self._compact()
+
+    def _compact(self):
+        # Caller holds the instance lock and the exclusive file lock
+        if not self._delta_records:
+            return
+
+        term_names = sorted(set(self._base_terms) | set(self._delta_postings))
+        postings = []
+        terms = {}
+        position = 0
+        for term in term_names:
+            parts = []
+            if term in self._base_terms:
+                start, end = self._base_terms[term]
+                parts.append(np.asarray(self._postings[start:end], dtype=np.int32))
+            if term in self._delta_postings:
+                parts.append(np.asarray(self._delta_postings[term], dtype=np.int32))
+            merged = np.concatenate(parts)
+            postings.append(merged)
+            terms[term] = [position, position + len(merged)]
+            position += len(merged)
+
+        delta_experience = [record["experience_years"] for record in self._delta_records]
+        experience = np.concatenate([
+            np.asarray(self._experience, dtype=np.float32),
+            np.asarray(delta_experience, dtype=np.float32)
+        ])
+        experience_order = np.argsort(experience, kind='stable').astype(np.int32)
+        arrays = {
+            "postings.npy": np.concatenate(postings) if postings else np.empty(0, dtype=np.int32),
+            "experience.npy": experience,
+            "experience_order.npy": experience_order,
+            "experience_sorted.npy": experience[experience_order],
+            "offsets.npy": np.concatenate([
+                np.asarray(self._offsets, dtype=np.int64),
+                np.asarray(self._delta_offsets, dtype=np.int64)
+            ]),
+            "hashes.npy": np.concatenate([
+                np.asarray(self._hashes, dtype=np.uint64),
+                np.asarray([_hash_value(r["hash"]) for r in self._delta_records], dtype=np.uint64)
+            ])
+        }
+
+        segment = f"segment-{len(self)}"
+        os.makedirs(self._path(segment), exist_ok=True)
+        for name, array in arrays.items():
+            np.save(self._path(segment, name), array)
+
+        manifest = {"segment": segment, "count": len(self), "log_bytes": self._log_bytes, "terms": terms}
+        tmp_path = self._path(f"{MANIFEST_FILE}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            json.dump(manifest, file)
+        os.replace(tmp_path, self._path(MANIFEST_FILE))
+
+        previous = self._segment
+        self._load_manifest()
+        if previous and previous != segment:
+            shutil.rmtree(self._path(previous), ignore_errors=True)
+
+    def search(self, term_weights, min_years=None, k=10):
+        """Top-k (candidate id, score) pairs plus the number of matching candidates"""
+        with self._lock:
+            with self._file_lock():
+                self._refresh()
+            base_count = self._base_count
+            total = len(self)
+            postings, base_terms = self._postings, self._base_terms
+            base_experience, experience_order = self._experience, self._experience_order
+            experience_sorted = self._experience_sorted
+            delta_postings = {term: list(self._delta_postings.get(term, ())) for term in term_weights}
+            delta_experience = np.asarray(
+                [record["experience_years"] for record in self._delta_records], dtype=np.float32
+            )
+
+        if total == 0:
+            return [], 0
+
+        if not term_weights:
+            # No skills requested: range query on experience via the sorted arrays
+            start = 0 if min_years is None else int(np.searchsorted(experience_sorted, min_years, side='left'))
+            base_ids = np.asarray(experience_order[start:][::-1][:k], dtype=np.int64)
+            delta_ids = np.flatnonzero(
+                delta_experience >= (min_years if min_years is not None else -np.inf)
+            )
+            ids = np.concatenate([base_ids, base_count + delta_ids])
+            values = np.concatenate([
+                np.asarray(base_experience[base_ids], dtype=np.float32), delta_experience[delta_ids]
+            ])
+            order = np.argsort(-values, kind='stable')[:k]
+            matches = (base_count - start) + len(delta_ids)
+            return [(int(ids[i]), float(values[i])) for i in order], int(matches)
+
+        id_parts = []
+        weight_parts = []
+        for term, weight in term_weights.items():
+            if term in base_terms:
+                start, end = base_terms[term]
+                id_parts.append(postings[start:end])
+                weight_parts.append(np.full(end - start, weight))
+            if delta_postings[term]:
+                id_parts.append(np.asarray(delta_postings[term], dtype=np.int32))
+                weight_parts.append(np.full(len(delta_postings[term]), weight))
+        if not id_parts:
+            return [], 0
+
+        scores = np.bincount(
+            np.concatenate(id_parts), weights=np.concatenate(weight_parts), minlength=total
+        )
+        if min_years is not None:
+            scores[:base_count][base_experience < min_years] = 0
+            scores[base_count:][delta_experience < min_years] = 0
+
+        matches = int(np.count_nonzero(scores))
+        if matches == 0:
+            return [], 0
+        k = min(k, matches)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(int(i), float(scores[i])) for i in top], matches
+
+    def get(self, candidate_id):
+        with self._lock:
+            if candidate_id >= len(self):
+                with self._file_lock():
+                    self._refresh()
+            if candidate_id >= self._base_count:
+                return dict(self._delta_records[candidate_id - self._base_count])
+            offset = int(self._offsets[candidate_id])
+        with open(self._path(LOG_FILE), 'rb') as log:
+            log.seek(offset)
+            return json.loads(log.readline())
+
+    def stats(self):
+        with self._lock:
+            with self._file_lock():
+                self._refresh()
+            return {
+                "candidates": len(self),
+                "compacted": self._base_count,
+                "pending": len(self._delta_records),
+                "terms": len(set(self._base_terms) | set(self._delta_postings))
+            }
@@ -0,0 +1,232 @@
+import datetime
+import functools
+import re
+import threading
+
+from keyword_matcher import KeywordMatcher, normalize_term
+
+
+@functools.lru_cache(maxsize=None)
+def load_spacy():
+    """spaCy, imported on first use since importing it takes about a second; None if not installed"""
+    try:
+        import spacy
+    except ImportError:  # fast mode then matches terms with the keyword matcher
+        return None
+    return spacy
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'(?<!\w)(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}(?!\d)')
+LINKEDIN_PATTERN = re.compile(r'linkedin\.com/in/[\w-]+', re.IGNORECASE)
+
+# "5 years of experience", "7+ yrs experience", "experience of 3 years"
+EXPERIENCE_PATTERN = re.compile(
+    r'(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b(?:\s+\w+){0,3}?\s+(?:of\s+)?experience'
+    r'|experience\s+of\s+(\d{1,2}(?:\.\d)?)\s*\+?\s*(?:years?|yrs?)\b',
+    re.IGNORECASE
+)
+DATE_RANGE_PATTERN = re.compile(
+    r'\b((?:19|20)\d{2})\s*(?:-|–|—|to)\s*((?:19|20)\d{2}|present|current|now)\b', re.IGNORECASE
+)
+# Short forms that are also words ("be", "me", "ma") need their dots, or must be capitalized and
+# followed by "in"/"of"/"(Hons)"; "master" needs a possessive or "of"/"in"/"degree" (not "Scrum Master")
+DEGREE_PATTERN = re.compile(
+    r"\b(?:bachelor(?:'?s)?|master(?:'?s\b|(?=\s+(?:of|in|degree)\b))|ph\.?\s?d|doctorate|mba|"
+    r"b\.?\s?tech|m\.?\s?tech|b\.?\s?sc|m\.?\s?sc|[bm]\.\s?[ae]\b\.?|"
+    r"(?-i:[BM][AE])(?=\s+(?:in|of)\b|\s*\()|associate(?:'s)? degree)\b\.?[^\n;]{0,80}",
+    re.IGNORECASE
+)
+QUANTIFIED_PATTERN = re.compile(r'\d+\s*%|\$\s?\d|\b\d+[kKmM]?\+?\s+(?:users|customers|clients|people|projects)\b')
+
+SKILL_LABEL = "SKILL"
+EDUCATION_LABEL = "EDUCATION"
+
+
+def extract_contact_info(text):
+    return {
+        "emails": list(dict.fromkeys(EMAIL_PATTERN.findall(text))),
+        "phones": list(dict.fromkeys(match.strip() for match in PHONE_PATTERN.findall(text))),
+        "linkedin": list(dict.fromkeys(match.lower() for match in LINKEDIN_PATTERN.findall(text)))
+    }
+
+
+def extract_experience_years(text, current_year):
+    """Largest stated "N years of experience", else the years covered by merged date ranges"""
+    stated = [float(a or b) for a, b in EXPERIENCE_PATTERN.findall(text)]
+    if stated:
+        return int(max(stated))
+
+    ranges = []
+    for start, end in DATE_RANGE_PATTERN.findall(text):
+        end_year = current_year if not end[0].isdigit() else int(end)
+        if int(start) <= end_year <= current_year:
+            ranges.append((int(start), end_year))
+    total = 0
+    covered_until = None
+    for start, end in sorted(ranges):
+        if covered_until is not None and start < covered_until:
+            start = covered_until
+        if end > start:
+            total += end - start
+            covered_until = end
+    return total
+
+
+class FastAnalyzer:
+    """Local, network-free resume analysis with the same fields as the Gemini analysis.
+
+    Skills and education keywords from the job profiles are matched by a spaCy entity
+    ruler (case-insensitive phrase patterns over the model's tokenizer). Contact details
+    and experience come from precompiled regexes. Without spaCy, the same terms are
+    matched with a KeywordMatcher.
+    """
+
+    def __init__(self, profiles=None, model_name='en_core_web_sm', n_process=1, batch_size=64):
+        self.model_name = model_name
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self._profiles = {}
+        self._matcher = KeywordMatcher()
+        self._nlp = None
+        self._ruler = None
+        self._version = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        for key, profile in (profiles or {}).items():
+            self.set_profile(key, profile)
+
+    def set_profile(self, key, profile):
+        terms = {
+            SKILL_LABEL: [normalize_term(term) for term in
+                          profile.get("required_skills", []) + profile.get("preferred_skills", [])],
+            EDUCATION_LABEL: [normalize_term(term) for term in profile.get("education_keywords", [])]
+        }
+        with self._lock:
+            self._profiles[key] = terms
+            self._ruler = None
+            self._version += 1
+        self._matcher.set_profile(key, profile)
+
+    def remove_profile(self, key):
+        with self._lock:
+            self._profiles.pop(key, None)
+            self._ruler = None
+            self._version += 1
+        self._matcher.remove_profile(key)
+
+    def _labels(self):
+        with self._lock:
+            labels = {}
+            for terms in self._profiles.values():
+                for label, label_terms in terms.items():
+                    for term in label_terms:
+                        if term:
+                            labels.setdefault(term, label)
+            return labels
+
+    def _load_model(self, spacy):
+        """The spaCy model, loaded once per process; profile changes never reload it"""
+        with self._load_lock:
+            if self._nlp is None:
+                try:
+                    # Only the tokenizer is needed; the statistical components would just add latency
+                    self._nlp = spacy.load(self.model_name, exclude=[
+                        "tok2vec", "tagger", "parser", "attribute_ruler", "lemmatizer", "ner", "senter"
+                    ])
+                except OSError:
+                    print(f"spaCy model {self.model_name} not installed, using a blank English tokenizer")
+                    self._nlp = spacy.blank("en")
+            return self._nlp
+
+    def _pipeline(self):
+        """Tokenizer and an entity ruler for the current profiles.
+
+        The ruler is a standalone component rebuilt after profile changes, so analyses already
+        running keep the ruler they started with and the model stays loaded.
+        """
+        spacy = load_spacy()
+        if spacy is None:
+            return None
+        nlp = self._load_model(spacy)
+        with self._lock:
+            ruler, version = self._ruler, self._version
+        if ruler is not None:
+            return nlp, ruler
+
+        from spacy.pipeline import EntityRuler
+        ruler = EntityRuler(nlp, phrase_matcher_attr="LOWER")
+        ruler.add_patterns([
+            {"label": label, "pattern": term, "id": term} for term, label in self._labels().items()
+        ])
+        with self._lock:
+            # A profile edited while building invalidates this ruler; the next call rebuilds it
+            if self._version == version:
+                self._ruler = ruler
+        return nlp, ruler
+
+    def analyze(self, text):
+        return self.analyze_many([text])[0]
+
+    def analyze_many(self, texts):
+        """Analyze several resumes; spaCy processes them as one batched nlp.pipe call"""
+        current_year = datetime.date.today().year
+        pipeline = self._pipeline()
+        if pipeline is None:
+            labels = self._labels()
+            matched = []
+            for text in texts:
+                lowered = text.lower()
+                found = sorted(
+                    (term for term in self._matcher.find_terms(text) if term in labels),
+                    key=lowered.find
+                )
+                matched.append([(term, labels[term]) for term in found])
+        else:
+            nlp, ruler = pipeline
+            matched = [
+                [(ent.ent_id_, ent.label_) for ent in ruler(doc).ents]
+                for doc in nlp.pipe(texts, n_process=self.n_process, batch_size=self.batch_size)
+            ]
+        return [self._analysis(text, terms, current_year) for text, terms in zip(texts, matched)]
+
+    def _analysis(self, text, terms, current_year):
+        skills = list(dict.fromkeys(term for term, label in terms if label == SKILL_LABEL))
+        education = list(dict.fromkeys(match.group(0).strip(' .,') for match in DEGREE_PATTERN.finditer(text)))
+        education_text = ' '.join(education).lower()
+        education += [
+            term for term in dict.fromkeys(term for term, label in terms if label == EDUCATION_LABEL)
+            if term not in education_text
+        ]
+        contact_info = extract_contact_info(text)
+        experience_years = extract_experience_years(text, current_year)
+        word_count = len(text.split())
+
+        recommendations = []
+        if not contact_info["emails"] or not contact_info["phones"]:
+            recommendations.append("Make sure an email address and phone number are easy to find at the top of the resume.")
+        if not contact_info["linkedin"]:
+            recommendations.append("Add a LinkedIn profile URL.")
+        if len(skills) < 5:
+            recommendations.append("List more of your technical skills explicitly, ideally in a dedicated skills section.")
+        if not QUANTIFIED_PATTERN.search(text):
+            recommendations.append("Quantify achievements with numbers, percentages or scale where possible.")
+        if word_count < 200:
+            recommendations.append("Expand on your experience; the resume is quite short.")
+        elif word_count > 1200:
+            recommendations.append("Tighten the resume; it is long enough that key points may be missed.")
+
+        skill_text = ', '.join(skills[:8]) if skills else "no profile skills detected"
+        return {
+            "contact_info": contact_info,
+            "skills": skills,
+            "experience_years": experience_years,
+            "education": education,
+            "recommendations": recommendations,
+            "summary": f"{experience_years} years of experience. Key skills: {skill_text}.",
+            "resume_description": (
+                f"{word_count} words with {len(skills)} recognized skills"
+                f"{' and education: ' + '; '.join(education[:3]) if education else ''}."
+            ),
+            "general_thoughts": "Generated locally in fast mode from keyword and pattern matching, without an AI review.",
+            "analysis_mode": "fast"
+        }
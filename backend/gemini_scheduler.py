@@ -0,0 +1,330 @@
+import asyncio
+import heapq
+import itertools
+import re
+import threading
+import time
+
+# Priority classes: lower values are admitted first
+INTERACTIVE = 0
+BATCH = 1
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", BATCH: "batch"}
+
+
+def estimate_tokens(text):
+    """Rough token estimate (about four characters per token) for budget accounting"""
+    return max(1, len(text) // 4)
+
+
+def is_rate_limit_error(error):
+    error_str = str(error)
+    return "429" in error_str or "quota" in error_str.lower()
+
+
+def parse_retry_delay(error):
+    """Seconds the server asked us to wait, if the error carries a retry_delay"""
+    error_str = str(error)
+    if "retry_delay" not in error_str:
+        return None
+    delay_match = re.search(r'seconds: (\d+)', error_str)
+    return int(delay_match.group(1)) if delay_match else None
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class TokenBucket:
+    """Per-minute budget refilled continuously; a rate of None means unlimited"""
+
+    def __init__(self, per_minute):
+        self.per_minute = per_minute
+        self.tokens = float(per_minute or 0)
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        if self.per_minute:
+            elapsed = now - self.updated_at
+            self.tokens = min(self.per_minute, self.tokens + elapsed * self.per_minute / 60.0)
+        self.updated_at = now
+
+    def wait_time(self, amount, now):
+        if not self.per_minute:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.per_minute)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) * 60.0 / self.per_minute
+
+    def consume(self, amount):
+        if self.per_minute:
+            self.tokens -= min(amount, self.per_minute)
+
+
+class GeminiScheduler:
+    """Process-wide gatekeeper for every model call.
+
+    Callers are admitted in priority order (FIFO within a class) once a concurrency
+    slot is free, the request and token budgets allow it, and no shared backoff is in
+    effect. A 429 from any caller pushes the shared backoff out by the server's
+    retry_delay, so all threads wait together instead of retrying independently.
+    When a metrics object is given, admission waits and model call times are recorded
+    as stages and every outcome is counted. Coroutines use generate_async, which waits
+    for admission on the event loop instead of blocking a thread, under the same limits.
+    With model_factory instead of a model, the client is created on the first call, in
+    whichever process makes it.
+    """
+
+    def __init__(self, model=None, requests_per_minute=None, tokens_per_minute=None,
+                 max_concurrency=4, max_retries=3, base_backoff=1.0, metrics=None, model_factory=None):
+        self._model = model
+        self._model_factory = model_factory
+        self._model_lock = threading.Lock()
+        self.metrics = metrics
+        self.max_concurrency = max_concurrency
+        # Retries after the first attempt, so 0 still makes one call
+        self.max_retries = max(0, max_retries)
+        self.base_backoff = base_backoff
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._async_waiters = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self._backoff_until = 0.0
+        self._metrics = {
+            "requests": 0,
+            "completed": 0,
+            "errors": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "backoff_seconds": 0.0
+        }
+        self._wait_stats = {
+            name: {"count": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            for name in PRIORITY_NAMES.values()
+        }
+
+    @property
+    def model(self):
+        if self._model is None and self._model_factory is not None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._model_factory()
+        return self._model
+
+    @model.setter
+    def model(self, model):
+        self._model = model
+
+    def generate(self, prompt, priority=INTERACTIVE, **kwargs):
+        """Call model.generate_content under the scheduler's limits, retrying 429s"""
+        estimated = estimate_tokens(prompt)
+        backoff = self.base_backoff
+
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority, estimated)
+            called_at = time.perf_counter()
+            try:
+                response = self.model.generate_content(prompt, **kwargs)
+            except Exception as e:
+                backoff = self._handle_error(e, attempt, backoff)
+                continue
+            finally:
+                self._release()
+                if self.metrics:
+                    self.metrics.record_stage("generate_content", time.perf_counter() - called_at)
+
+            self._record("completed")
+            return response
+
+    async def generate_async(self, prompt, priority=INTERACTIVE, **kwargs):
+        """generate() for coroutines, using model.generate_content_async"""
+        estimated = estimate_tokens(prompt)
+        backoff = self.base_backoff
+
+        for attempt in range(self.max_retries + 1):
+            await self._acquire_async(priority, estimated)
+            called_at = time.perf_counter()
+            try:
+                response = await self.model.generate_content_async(prompt, **kwargs)
+            except Exception as e:
+                backoff = self._handle_error(e, attempt, backoff)
+                continue
+            finally:
+                self._release()
+                if self.metrics:
+                    self.metrics.record_stage("generate_content", time.perf_counter() - called_at)
+
+            self._record("completed")
+            return response
+
+    def stream(self, prompt, priority=INTERACTIVE, **kwargs):
+        """Streaming generate_content; the slot is held until the stream is exhausted or closed.
+
+        A 429 is only retried if it arrives before the first chunk has been yielded.
+        """
+        estimated = estimate_tokens(prompt)
+        backoff = self.base_backoff
+
+        for attempt in range(self.max_retries + 1):
+            started = False
+            self._acquire(priority, estimated)
+            try:
+                for chunk in self.model.generate_content(prompt, stream=True, **kwargs):
+                    started = True
+                    yield chunk
+            except Exception as e:
+                if started:
+                    self._record("errors")
+                    raise
+                backoff = self._handle_error(e, attempt, backoff)
+                continue
+            finally:
+                self._release()
+
+            self._record("completed")
+            return
+
+    def _handle_error(self, error, attempt, backoff):
+        """Re-raise errors that should not be retried; otherwise back off and return the next backoff"""
+        if not is_rate_limit_error(error):
+            self._record("errors")
+            raise error
+        self._record("rate_limited")
+        if attempt == self.max_retries:
+            raise error
+        delay = parse_retry_delay(error) or backoff
+        self._back_off(delay)
+        self._record("retries")
+        print(f"Rate limit hit. All Gemini calls paused for {delay} seconds before retry...")
+        return backoff * 2
+
+    def _enqueue(self, priority):
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            self._metrics["requests"] += 1
+        return ticket
+
+    def _admission_delay(self, ticket, estimated_tokens):
+        """Seconds until the ticket can be admitted (<= 0 means now), or None while it must wait its turn"""
+        if self._waiting[0] != ticket or self._in_flight >= self.max_concurrency:
+            return None
+        now = time.monotonic()
+        return max(
+            self._backoff_until - now,
+            self._requests.wait_time(1, now),
+            self._tokens.wait_time(estimated_tokens, now)
+        )
+
+    def _admit(self, ticket, priority, estimated_tokens, enqueued_at):
+        heapq.heappop(self._waiting)
+        self._requests.consume(1)
+        self._tokens.consume(estimated_tokens)
+        self._in_flight += 1
+
+        waited = time.monotonic() - enqueued_at
+        stats = self._wait_stats[PRIORITY_NAMES.get(priority, "batch")]
+        stats["count"] += 1
+        stats["total_seconds"] += waited
+        stats["max_seconds"] = max(stats["max_seconds"], waited)
+        # The next ticket in line may be admissible now
+        self._notify_all()
+        return waited
+
+    def _abandon(self, ticket):
+        with self._cond:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+            self._notify_all()
+
+    def _acquire(self, priority, estimated_tokens):
+        enqueued_at = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            with self._cond:
+                while True:
+                    timeout = self._admission_delay(ticket, estimated_tokens)
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._cond.wait(timeout)
+                waited = self._admit(ticket, priority, estimated_tokens, enqueued_at)
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        if self.metrics:
+            self.metrics.record_stage("gemini_wait", waited)
+
+    async def _acquire_async(self, priority, estimated_tokens):
+        loop = asyncio.get_running_loop()
+        enqueued_at = time.monotonic()
+        ticket = self._enqueue(priority)
+        try:
+            while True:
+                with self._cond:
+                    timeout = self._admission_delay(ticket, estimated_tokens)
+                    if timeout is not None and timeout <= 0:
+                        waited = self._admit(ticket, priority, estimated_tokens, enqueued_at)
+                        break
+                    wakeup = loop.create_future()
+                    self._async_waiters.append((loop, wakeup))
+                try:
+                    await asyncio.wait_for(wakeup, timeout)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            self._abandon(ticket)
+            raise
+        if self.metrics:
+            self.metrics.record_stage("gemini_wait", waited)
+
+    def _notify_all(self):
+        # Called with the condition held; wakes threads and event-loop waiters alike
+        self._cond.notify_all()
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, wakeup in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, wakeup)
+            except RuntimeError:
+                # The waiter's event loop has been closed
+                pass
+
+    def _release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._notify_all()
+
+    def _back_off(self, delay):
+        with self._cond:
+            until = time.monotonic() + delay
+            if until > self._backoff_until:
+                self._metrics["backoff_seconds"] += until - max(self._backoff_until, time.monotonic())
+                self._backoff_until = until
+            self._notify_all()
+
+    def _record(self, name):
+        with self._cond:
+            self._metrics[name] += 1
+        if self.metrics:
+            self.metrics.increment("gemini_calls_total", outcome=name)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats["queue_depth"] = len(self._waiting)
+            stats["in_flight"] = self._in_flight
+            stats["backoff_remaining_seconds"] = round(max(0.0, self._backoff_until - time.monotonic()), 3)
+            stats["wait_time"] = {}
+            for name, wait in self._wait_stats.items():
+                stats["wait_time"][name] = {
+                    "count": wait["count"],
+                    "avg_seconds": round(wait["total_seconds"] / wait["count"], 4) if wait["count"] else 0.0,
+                    "max_seconds": round(wait["max_seconds"], 4)
+                }
+        stats["backoff_seconds"] = round(stats["backoff_seconds"], 3)
+        return stats
@@ -0,0 +1,195 @@
+import json
+import os
+import queue
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another submission"""
+
+
+def _owner_alive(owner, host):
+    """Whether the "host:pid" process that created a job may still be running it"""
+    if not owner:
+        return False
+    owner_host, _, pid = owner.rpartition(':')
+    if owner_host != host:
+        return True  # another machine's process; nothing to check from here
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, ValueError):
+        return True
+    return True
+
+
+class InMemoryJobStore:
+    """Job records kept in a dict; finished jobs are pruned after the retention window"""
+
+    def __init__(self, retention_seconds=3600):
+        self.retention_seconds = retention_seconds
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id, record):
+        with self._lock:
+            self._prune()
+            self._jobs[job_id] = dict(record)
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        with self._lock:
+            record = self._jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+    def _prune(self):
+        cutoff = time.time() - self.retention_seconds
+        expired = [
+            job_id for job_id, record in self._jobs.items()
+            if record.get("finished_at") and record["finished_at"] < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+class SQLiteJobStore:
+    """Job records persisted in a SQLite table, shared by all worker threads.
+
+    The queue itself is in memory, so on startup jobs still queued or running in a process
+    that no longer exists are marked failed instead of being polled forever. Each job records
+    the process that created it, so server workers sharing the file leave each other's alone.
+    """
+
+    COLUMNS = ("id", "status", "submitted_at", "started_at", "finished_at", "result", "error", "meta")
+
+    def __init__(self, path, retention_seconds=3600):
+        self.retention_seconds = retention_seconds
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT, submitted_at REAL, started_at REAL, "
+                "finished_at REAL, result TEXT, error TEXT, meta TEXT)"
+            )
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            if "owner" not in columns:
+                self._conn.execute("ALTER TABLE jobs ADD COLUMN owner TEXT")
+        self._fail_interrupted()
+
+    def _fail_interrupted(self):
+        host = socket.gethostname()
+        with self._lock, self._conn:
+            rows = self._conn.execute(
+                "SELECT id, owner FROM jobs WHERE status IN ('queued', 'running')"
+            ).fetchall()
+            now = time.time()
+            interrupted = [(now, job_id) for job_id, owner in rows if not _owner_alive(owner, host)]
+            self._conn.executemany(
+                "UPDATE jobs SET status = 'failed', error = 'Interrupted by restart', finished_at = ? WHERE id = ?",
+                interrupted
+            )
+        if interrupted:
+            print(f"Marked {len(interrupted)} interrupted jobs as failed")
+
+    def create(self, job_id, record):
+        row = self._encode(dict(record, id=job_id))
+        row["owner"] = f"{socket.gethostname()}:{os.getpid()}"
+        columns = [*self.COLUMNS, "owner"]
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - self.retention_seconds,)
+            )
+            self._conn.execute(
+                f"INSERT INTO jobs ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                [row.get(column) for column in columns]
+            )
+
+    def update(self, job_id, **fields):
+        row = self._encode(fields)
+        assignments = ', '.join(f"{column} = ?" for column in row)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", [*row.values(), job_id])
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(self.COLUMNS)} FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        record = dict(zip(self.COLUMNS, row))
+        for column in ("result", "meta"):
+            if record[column] is not None:
+                record[column] = json.loads(record[column])
+        del record["id"]
+        return {key: value for key, value in record.items() if value is not None}
+
+    def _encode(self, fields):
+        row = {}
+        for column, value in fields.items():
+            if column not in self.COLUMNS:
+                continue
+            row[column] = json.dumps(value) if column in ("result", "meta") else value
+        return row
+
+
+class JobQueue:
+    """Bounded queue of background jobs processed by a pool of worker threads"""
+
+    def __init__(self, store, workers=4, max_pending=100):
+        self.store = store
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._threads = []
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        # Workers start on first use so forked server processes each get their own
+        with self._start_lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._worker, name=f"job-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, fn, *args, meta=None):
+        self._ensure_started()
+        job_id = uuid.uuid4().hex
+        self.store.create(job_id, {"status": "queued", "submitted_at": time.time(), "meta": meta or {}})
+        try:
+            self._queue.put_nowait((job_id, fn, args))
+        except queue.Full:
+            self.store.update(job_id, status="rejected", finished_at=time.time(), error="Job queue is full")
+            raise QueueFullError("Job queue is full")
+        return job_id
+
+    def get(self, job_id):
+        return self.store.get(job_id)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def _worker(self):
+        while True:
+            job_id, fn, args = self._queue.get()
+            self.store.update(job_id, status="running", started_at=time.time())
+            try:
+                result = fn(*args)
+                self.store.update(job_id, status="completed", finished_at=time.time(), result=result)
+            except Exception as e:
+                print(f"Error processing job {job_id}: {e}")
+                self.store.update(job_id, status="failed", finished_at=time.time(), error=str(e))
+            finally:
+                self._queue.task_done()
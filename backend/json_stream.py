@@ -0,0 +1,133 @@
+import json
+
+
+class TopLevelFieldParser:
+    """Incrementally parses a streamed JSON object, yielding each top-level field once complete.
+
+    Text before the opening brace (such as a ```json fence) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._position = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._member_start = None
+        self._finished = False
+
+    def feed(self, chunk):
+        """Add streamed text; returns (key, value) pairs for fields completed by it"""
+        self._buffer += chunk
+        completed = []
+        while self._position < len(self._buffer) and not self._finished:
+            char = self._buffer[self._position]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._member_start is None:
+                    self._member_start = self._position
+            elif char in '{[':
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 1:
+                    self._finish_member(completed)
+                    self._finished = True
+                self._depth -= 1
+            elif char == ',' and self._depth == 1:
+                self._finish_member(completed)
+            self._position += 1
+        return completed
+
+    def _finish_member(self, completed):
+        if self._member_start is None:
+            return
+        member = self._buffer[self._member_start:self._position]
+        self._member_start = None
+        try:
+            completed.extend(json.loads("{" + member + "}").items())
+        except ValueError:
+            pass
+
+    @property
+    def finished(self):
+        return self._finished
+
+
+_CLOSERS = {'{': '}', '[': ']'}
+
+
+def parse_json_lenient(text):
+    """Parse a model's JSON object, repairing what truncation and sloppy output break.
+
+    Leading prose or code fences are skipped, trailing commas are dropped, and a truncated
+    object is cut back to its last complete member and closed. Returns (value, repaired);
+    raises ValueError when no object can be recovered.
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("No JSON object in response")
+    body = text[start:]
+    end = body.rfind('}')
+    if end != -1:
+        try:
+            return json.loads(body[:end + 1]), False
+        except ValueError:
+            pass
+
+    # Rebuild the text without trailing commas, remembering where each comma outside a string
+    # was and which containers were open there, so the object can be cut back to it
+    output = []
+    stack = []
+    cuts = []
+    in_string = escaped = False
+    for char in body:
+        if in_string:
+            output.append(char)
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        if char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append(char)
+        elif char in '}]':
+            while output and output[-1].isspace():
+                output.pop()
+            if output and output[-1] == ',':
+                output.pop()
+                cuts.pop()
+            if not stack:
+                break
+            stack.pop()
+            output.append(char)
+            if not stack:
+                break
+            continue
+        elif char == ',':
+            cuts.append((len(output), list(stack)))
+        output.append(char)
+
+    candidates = []
+    if not in_string:
+        candidates.append(("".join(output).rstrip().rstrip(','), stack))
+    for position, open_containers in reversed(cuts):
+        candidates.append(("".join(output[:position]), open_containers))
+    for prefix, open_containers in candidates:
+        try:
+            value = json.loads(prefix + "".join(_CLOSERS[char] for char in reversed(open_containers)))
+        except ValueError:
+            continue
+        if isinstance(value, dict):
+            return value, True
+    raise ValueError("Could not repair JSON object in response")
@@ -0,0 +1,186 @@
+import re
+import threading
+
+# Weighted scoring used for match_details: category -> (weight, match field, score field)
+SCORING_CATEGORIES = {
+    "required_skills": (40, "required_skills_match", "required_score"),
+    "preferred_skills": (25, "preferred_skills_match", "preferred_score"),
+    "experience_keywords": (20, "experience_keywords_match", "experience_score"),
+    "education_keywords": (15, "education_keywords_match", "education_score"),
+}
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_term(term):
+    return _WHITESPACE.sub(' ', str(term).strip().lower())
+
+
+# Tokens keep inner punctuation so terms like node.js, ci/cd, c++, scikit-learn and r&d stay
+# whole, and a leading dot so .net does too. Resumes and profile terms use the same tokenizer
+_TOKEN = re.compile(r"\.?[a-z0-9+#][a-z0-9+#./&'-]*[a-z0-9+#]|\.?[a-z0-9+#]")
+MAX_NGRAM_WORDS = 3
+
+
+def tokenize(text):
+    return _TOKEN.findall(text.lower())
+
+
+def term_key(term):
+    """A term as the n-gram it has to appear as; '' if it has no tokens"""
+    return ' '.join(tokenize(term))
+
+
+_PART_SEPARATOR = re.compile(r"[/-]")
+
+
+def split_tokens(tokens):
+    """Tokens broken at "/" and "-", with a possessive "'s" removed, so "python/java",
+    "sql-server" and "python's" also count as python, java and sql"""
+    parts = []
+    for token in tokens:
+        if token.endswith("'s"):
+            token = token[:-2]
+        for part in _PART_SEPARATOR.split(token):
+            parts.extend(_TOKEN.findall(part))
+    return parts
+
+
+def resume_ngrams(text, max_words=MAX_NGRAM_WORDS):
+    """Profile-independent set of 1..max_words word n-grams, used to score any profile later.
+
+    N-grams of the whole tokens (so ci/cd and node.js match) and of their split parts.
+    """
+    tokens = tokenize(text)
+    ngrams = set()
+    for sequence in (tokens, split_tokens(tokens)):
+        for size in range(1, max_words + 1):
+            for start in range(len(sequence) - size + 1):
+                ngrams.add(' '.join(sequence[start:start + size]))
+    return ngrams
+
+
+def key_in_ngrams(key, ngrams):
+    """Whether a term key is in an n-gram set; longer keys are approximated by their windows"""
+    words = key.split(' ')
+    if len(words) <= MAX_NGRAM_WORDS:
+        return key in ngrams
+    # Longer terms: every overlapping window must be present, though the windows may come
+    # from different places in the resume
+    return all(
+        ' '.join(words[i:i + MAX_NGRAM_WORDS]) in ngrams
+        for i in range(len(words) - MAX_NGRAM_WORDS + 1)
+    )
+
+
+class KeywordMatcher:
+    """Matches every job profile keyword against a resume's n-gram set.
+
+    A term of up to MAX_NGRAM_WORDS tokens matches when those tokens appear consecutively in
+    the resume. Only short n-grams are cached, so a longer term matches when each of its
+    MAX_NGRAM_WORDS-word windows appears somewhere, not necessarily next to each other.
+    Live text and cached extractions are matched the same way, since find_terms works on
+    resume_ngrams(text): each n-gram is one hash lookup in an index of every profile's terms.
+    """
+
+    def __init__(self, profiles=None):
+        self._profiles = {}
+        self._term_refs = {}
+        self._index = None
+        self._lock = threading.Lock()
+        for key, profile in (profiles or {}).items():
+            self.set_profile(key, profile)
+
+    def set_profile(self, key, profile):
+        terms = {
+            category: list(dict.fromkeys(
+                normalize_term(term) for term in profile.get(category, []) if normalize_term(term)
+            ))
+            for category in SCORING_CATEGORIES
+        }
+        with self._lock:
+            self._remove_refs(key)
+            self._profiles[key] = terms
+            for category_terms in terms.values():
+                for term in category_terms:
+                    if term not in self._term_refs:
+                        self._term_refs[term] = 0
+                        self._index = None
+                    self._term_refs[term] += 1
+
+    def remove_profile(self, key):
+        with self._lock:
+            self._remove_refs(key)
+            self._profiles.pop(key, None)
+
+    def _remove_refs(self, key):
+        for category_terms in self._profiles.get(key, {}).values():
+            for term in category_terms:
+                self._term_refs[term] -= 1
+                if self._term_refs[term] == 0:
+                    del self._term_refs[term]
+                    self._index = None
+
+    def _compiled(self):
+        """(n-gram -> terms, longer-than-n-gram key -> terms), rebuilt after profile changes"""
+        with self._lock:
+            if self._index is None:
+                short, long = {}, {}
+                for term in self._term_refs:
+                    key = term_key(term)
+                    if key:
+                        index = long if key.count(' ') >= MAX_NGRAM_WORDS else short
+                        index.setdefault(key, []).append(term)
+                self._index = (short, long)
+            return self._index
+
+    def terms_in_ngrams(self, ngrams):
+        """Every profile keyword present in a resume's n-gram set"""
+        short, long = self._compiled()
+        found = set()
+        if len(short) < len(ngrams):
+            for key, terms in short.items():
+                if key in ngrams:
+                    found.update(terms)
+        else:
+            for ngram in ngrams:
+                found.update(short.get(ngram, ()))
+        for key, terms in long.items():
+            if key_in_ngrams(key, ngrams):
+                found.update(terms)
+        return found
+
+    def find_terms(self, text):
+        """Every profile keyword present in the text"""
+        return self.terms_in_ngrams(resume_ngrams(text))
+
+    def has_profile(self, key):
+        return key in self._profiles
+
+    def score(self, found_terms, key):
+        """match_score and match_details for one profile given the terms found in a resume"""
+        profile_terms = self._profiles.get(key)
+        if profile_terms is None:
+            return 0, {}
+
+        match_details = {}
+        match_score = 0
+        for category, (weight, match_field, score_field) in SCORING_CATEGORIES.items():
+            terms = profile_terms[category]
+            matched = sum(1 for term in terms if term in found_terms)
+            score = round(weight * matched / len(terms)) if terms else 0
+            match_details[match_field] = f"{matched}/{len(terms)}"
+            match_details[score_field] = score
+            match_score += score
+        return match_score, match_details
+
+    def score_ngrams(self, ngrams, key):
+        """Score a profile against a resume's n-gram set instead of its text"""
+        return self.score(self.terms_in_ngrams(ngrams), key)
+
+    def missing_terms(self, ngrams, key, category="required_skills"):
+        found = self.terms_in_ngrams(ngrams)
+        return [term for term in self._profiles.get(key, {}).get(category, []) if term not in found]
+
+    def score_text(self, text, key):
+        return self.score(self.find_terms(text), key)
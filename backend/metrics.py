@@ -0,0 +1,137 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram buckets in seconds, from in-memory work up to slow model calls
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Stage timings of the request handled in this context (thread or asyncio task), for Server-Timing
+_request_stages = contextvars.ContextVar('request_stages', default=None)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels, extra=None):
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value):
+    return repr(value) if isinstance(value, float) else str(int(value))
+
+
+def server_timing(stages):
+    """Server-Timing header value for (stage, seconds) pairs"""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in stages)
+
+
+class Metrics:
+    """In-process histograms, counters and gauges rendered in the Prometheus text format"""
+
+    def __init__(self, prefix='resume_analyzer', buckets=DEFAULT_BUCKETS):
+        self.prefix = prefix
+        self.buckets = tuple(buckets)
+        self._histograms = {}
+        self._counters = {}
+        self._help = {}
+        self._gauge_sources = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, seconds, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            state = series.get(key)
+            if state is None:
+                state = series[key] = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    state["buckets"][index] += 1
+                    break
+            state["sum"] += seconds
+            state["count"] += 1
+
+    def increment(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def add_gauges(self, source):
+        """source() returns {name: value}; called on every render"""
+        self._gauge_sources.append(source)
+
+    def record_stage(self, stage, seconds):
+        """Add a stage duration to the stage histogram and to the current request's timings"""
+        self.observe("stage_seconds", seconds, stage=stage)
+        stages = _request_stages.get()
+        if stages is not None:
+            stages.append((stage, seconds))
+
+    @contextmanager
+    def span(self, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_stage(stage, time.perf_counter() - started)
+
+    def start_request(self):
+        return _request_stages.set([])
+
+    def finish_request(self, token):
+        """Stage timings recorded since start_request, in the order they finished"""
+        stages = _request_stages.get() or []
+        _request_stages.reset(token)
+        return stages
+
+    def render(self):
+        lines = []
+        with self._lock:
+            histograms = {
+                name: {key: dict(state, buckets=list(state["buckets"])) for key, state in series.items()}
+                for name, series in self._histograms.items()
+            }
+            counters = {name: dict(series) for name, series in self._counters.items()}
+
+        for name, series in sorted(histograms.items()):
+            full_name = f"{self.prefix}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} histogram")
+            for key, state in sorted(series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, state["buckets"]):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(key, ('le', repr(bound)))} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(key, ('le', '+Inf'))} {state['count']}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {state['sum']!r}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {state['count']}")
+
+        for name, series in sorted(counters.items()):
+            full_name = f"{self.prefix}_{name}"
+            if name in self._help:
+                lines.append(f"# HELP {full_name} {self._help[name]}")
+            lines.append(f"# TYPE {full_name} counter")
+            for key, value in sorted(series.items()):
+                lines.append(f"{full_name}{_format_labels(key)} {_format_value(value)}")
+
+        for source in self._gauge_sources:
+            try:
+                gauges = source()
+            except Exception as e:
+                print(f"Error collecting gauges: {e}")
+                continue
+            for name, value in sorted(gauges.items()):
+                full_name = f"{self.prefix}_{name}"
+                lines.append(f"# TYPE {full_name} gauge")
+                lines.append(f"{full_name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,114 @@
+import os
+import re
+import threading
+import zlib
+
+import numpy as np
+
+_WORD = re.compile(r'[a-z0-9]+')
+_PRIME = (1 << 31) - 1
+
+
+def shingles(text, size=3):
+    """Hashed word k-shingles of the normalized text; formatting and case do not matter"""
+    words = _WORD.findall(text.lower())
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {
+        zlib.crc32(' '.join(words[i:i + size]).encode('utf-8'))
+        for i in range(len(words) - size + 1)
+    }
+
+
+class NearDuplicateIndex:
+    """MinHash signatures of analyzed resumes in a banded LSH index.
+
+    A new resume is compared only against resumes sharing at least one band bucket, and
+    matches are kept when their estimated Jaccard similarity reaches the threshold. With a
+    path, signatures are appended to a fixed-size binary record file and reloaded on start.
+    """
+
+    def __init__(self, threshold=0.8, num_perm=128, bands=32, shingle_size=3, path=None, seed=1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.path = path
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, _PRIME, size=num_perm).astype(np.uint64)
+        self._b = rng.randint(0, _PRIME, size=num_perm).astype(np.uint64)
+        self._record = np.dtype([('id', 'S64'), ('signature', '<u4', (num_perm,))])
+        self._signatures = {}
+        self._buckets = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+
+        if path and os.path.exists(path):
+            records = np.fromfile(path, dtype=self._record)
+            for record in records:
+                self._insert(record['id'].decode('ascii'), np.array(record['signature']))
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def signature(self, text):
+        """MinHash signature of the text, or None if it has no words"""
+        hashed = np.fromiter(shingles(text, self.shingle_size), dtype=np.uint64) % _PRIME
+        if hashed.size == 0:
+            return None
+        permuted = (self._a[:, None] * hashed[None, :] + self._b[:, None]) % _PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows].tobytes() for i in range(self.bands)]
+
+    def _insert(self, doc_id, signature):
+        if doc_id in self._signatures:
+            return False
+        self._signatures[doc_id] = signature
+        for band, key in zip(self._buckets, self._band_keys(signature)):
+            band.setdefault(key, []).append(doc_id)
+        return True
+
+    def add(self, doc_id, signature):
+        if signature is None:
+            return
+        with self._lock:
+            if not self._insert(doc_id, signature) or not self.path:
+                return
+            record = np.zeros(1, dtype=self._record)
+            record['id'] = doc_id.encode('ascii')
+            record['signature'] = signature
+            try:
+                with open(self.path, 'ab') as file:
+                    file.write(record.tobytes())
+            except OSError as e:
+                print(f"Error writing near-duplicate signature: {e}")
+
+    def query(self, signature, exclude=None):
+        """(id, estimated similarity) pairs at or above the threshold, most similar first"""
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for band, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(band.get(key, ()))
+            candidates.discard(exclude)
+            scored = [
+                (doc_id, float(np.mean(self._signatures[doc_id] == signature)))
+                for doc_id in candidates
+            ]
+        matches = [(doc_id, similarity) for doc_id, similarity in scored if similarity >= self.threshold]
+        return sorted(matches, key=lambda match: -match[1])
+
+    def stats(self):
+        with self._lock:
+            return {
+                "signatures": len(self._signatures),
+                "threshold": self.threshold,
+                "num_perm": self.num_perm,
+                "bands": self.bands,
+                "persistent": bool(self.path)
+            }
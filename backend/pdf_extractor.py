@@ -0,0 +1,151 @@
+import io
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import parent_process
+
+
+from gemini_scheduler import estimate_tokens
+
+
+def _extract_pages(reader, start, end, deadline):
+    pages = []
+    for index in range(start, end):
+        if deadline is not None and time.time() >= deadline:
+            break
+        started = time.perf_counter()
+        try:
+            text = reader.pages[index].extract_text() or ""
+        except Exception as e:
+            print(f"Error reading PDF page {index + 1}: {e}")
+            text = ""
+        pages.append((index, text, time.perf_counter() - started))
+    return pages
+
+
+def extract_page_range(data, start, end, deadline=None):
+    """Extract pages [start, end) from PDF bytes, stopping at the wall-clock deadline.
+
+    Runs in a worker process; returns (page index, text, seconds) for each page reached.
+    """
+    import PyPDF2
+    return _extract_pages(PyPDF2.PdfReader(io.BytesIO(data)), start, end, deadline)
+
+
+class PdfExtractor:
+    """Bounded PDF text extraction.
+
+    Long documents are split into page ranges that run on a process pool, a few at a
+    time and in page order. Extraction stops at the page cap, when the per-document time
+    budget runs out, or once enough text has been collected for the prompt budget.
+    Short documents, and calls from inside another worker process, are extracted inline.
+    """
+
+    def __init__(self, max_workers=4, max_pages=40, time_budget=8.0, token_target=None,
+                 chunk_pages=8, parallel_min_pages=8):
+        self.max_workers = max_workers
+        self.max_pages = max_pages
+        self.time_budget = time_budget
+        self.token_target = token_target
+        self.chunk_pages = chunk_pages
+        self.parallel_min_pages = parallel_min_pages
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._pool
+
+    def extract(self, data):
+        """Text (pages separated by form feeds) and extraction stats for PDF bytes"""
+        started = time.time()
+        deadline = started + self.time_budget if self.time_budget else None
+        import PyPDF2  # imported on first use to keep app startup fast
+        reader = PyPDF2.PdfReader(io.BytesIO(data))
+        total_pages = len(reader.pages)
+        page_limit = min(total_pages, self.max_pages) if self.max_pages else total_pages
+        ranges = [
+            (start, min(start + self.chunk_pages, page_limit))
+            for start in range(0, page_limit, self.chunk_pages)
+        ]
+
+        parallel = (
+            self.max_workers > 1 and len(ranges) > 1
+            and page_limit >= self.parallel_min_pages and parent_process() is None
+        )
+        if parallel:
+            pages, stopped = self._extract_parallel(data, ranges, deadline)
+        else:
+            pages, stopped = self._extract_inline(reader, ranges, deadline)
+        if stopped is None and page_limit < total_pages:
+            stopped = "page_cap"
+
+        pages.sort()
+        return "\f".join(text for _, text, _ in pages), {
+            "pages_total": total_pages,
+            "pages_extracted": len(pages),
+            "parallel": parallel,
+            "stopped": stopped,
+            "elapsed_seconds": round(time.time() - started, 4),
+            "page_timings": [{"page": index + 1, "seconds": round(seconds, 4)} for index, _, seconds in pages]
+        }
+
+    def _enough_text(self, tokens):
+        # A target of None or 0 means no target, like a time budget of 0
+        return self.token_target is not None and 0 < self.token_target <= tokens
+
+    def _extract_inline(self, reader, ranges, deadline):
+        pages = []
+        tokens = 0
+        for start, end in ranges:
+            extracted = _extract_pages(reader, start, end, deadline)
+            pages.extend(extracted)
+            tokens += sum(estimate_tokens(text) for _, text, _ in extracted)
+            if len(extracted) < end - start:
+                return pages, "time_budget"
+            if self._enough_text(tokens):
+                return pages, "token_target"
+        return pages, None
+
+    def _extract_parallel(self, data, ranges, deadline):
+        pool = self._get_pool()
+        pending = {}
+        remaining_ranges = list(reversed(ranges))
+        pages = []
+        tokens = 0
+        stopped = None
+
+        while remaining_ranges or pending:
+            # Keep at most one range per worker in flight so an early stop wastes little work
+            while remaining_ranges and len(pending) < self.max_workers and stopped is None:
+                start, end = remaining_ranges.pop()
+                pending[pool.submit(extract_page_range, data, start, end, deadline)] = (start, end)
+            if not pending:
+                break
+
+            timeout = None if deadline is None else max(0.0, deadline - time.time())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            if not done:
+                # Out of time: abandon the ranges still running rather than block the request
+                for future in pending:
+                    future.cancel()
+                return pages, "time_budget"
+
+            for future in done:
+                start, end = pending.pop(future)
+                try:
+                    extracted = future.result()
+                except Exception as e:
+                    print(f"Error reading PDF pages {start + 1}-{end}: {e}")
+                    continue
+                pages.extend(extracted)
+                tokens += sum(estimate_tokens(text) for _, text, _ in extracted)
+                if len(extracted) < end - start:
+                    stopped = stopped or "time_budget"
+            if stopped is None and self._enough_text(tokens):
+                # Let the ranges already running finish so the kept text has no gaps
+                stopped = "token_target"
+
+        return pages, stopped
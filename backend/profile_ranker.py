@@ -0,0 +1,114 @@
+import threading
+
+import numpy as np
+
+from keyword_matcher import SCORING_CATEGORIES, normalize_term
+
+
+def profile_term_weights(profile):
+    """Per-term weights for one profile; a full match across all categories scores 100"""
+    weights = {}
+    for category, (weight, _, _) in SCORING_CATEGORIES.items():
+        terms = list(dict.fromkeys(
+            normalize_term(term) for term in profile.get(category, []) if normalize_term(term)
+        ))
+        for term in terms:
+            weights[term] = weights.get(term, 0.0) + weight / len(terms)
+    return weights
+
+
+class ProfileRanker:
+    """Sparse profile-by-term weight matrix; ranking every profile is one matrix-vector product.
+
+    Profiles set before the first rank() are only recorded and built into the matrix in one go,
+    so loading many profiles stays linear and scipy is not imported until something is ranked.
+    After that, each change adds, replaces or drops a single row.
+    """
+
+    def __init__(self, profiles=None):
+        self._columns = {}
+        self._keys = []
+        self._matrix = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        for key, profile in (profiles or {}).items():
+            self.set_profile(key, profile)
+
+    def set_profile(self, key, profile):
+        weights = profile_term_weights(profile)
+        with self._lock:
+            for term in weights:
+                if term not in self._columns:
+                    self._columns[term] = len(self._columns)
+            if self._matrix is None:
+                self._pending[key] = weights
+            else:
+                self._set_row(key, weights)
+
+    def remove_profile(self, key):
+        with self._lock:
+            if self._matrix is None:
+                self._pending.pop(key, None)
+                return
+            if key not in self._keys:
+                return
+            index = self._keys.index(key)
+            keep = [i for i in range(len(self._keys)) if i != index]
+            self._matrix = self._matrix[keep]
+            del self._keys[index]
+
+    def _set_row(self, key, weights):
+        from scipy import sparse
+
+        matrix = self._matrix
+        if matrix.shape[1] < len(self._columns):
+            # A new matrix rather than resize(), which would change one a rank() may be using
+            matrix = sparse.csr_matrix(
+                (matrix.data, matrix.indices, matrix.indptr), shape=(matrix.shape[0], len(self._columns))
+            )
+        columns = [self._columns[term] for term in weights]
+        row = sparse.csr_matrix(
+            (list(weights.values()), ([0] * len(columns), columns)),
+            shape=(1, len(self._columns))
+        )
+        if key in self._keys:
+            index = self._keys.index(key)
+            self._matrix = sparse.vstack([matrix[:index], row, matrix[index + 1:]], format='csr')
+        else:
+            self._matrix = sparse.vstack([matrix, row], format='csr')
+            self._keys.append(key)
+
+    def _build(self):
+        from scipy import sparse
+
+        keys = list(self._pending)
+        data, rows, columns = [], [], []
+        for index, key in enumerate(keys):
+            for term, weight in self._pending[key].items():
+                data.append(weight)
+                rows.append(index)
+                columns.append(self._columns[term])
+        self._matrix = sparse.csr_matrix(
+            (np.array(data, dtype=np.float64), (rows, columns)),
+            shape=(len(keys), len(self._columns))
+        )
+        self._keys = keys
+        self._pending = {}
+
+    def rank(self, found_terms, top=None):
+        """(profile key, score) pairs for every profile, best match first"""
+        with self._lock:
+            if self._matrix is None:
+                self._build()
+            matrix, keys = self._matrix, list(self._keys)
+            resume_vector = np.zeros(matrix.shape[1], dtype=np.float64)
+            hits = [self._columns[term] for term in found_terms if term in self._columns]
+
+        if not keys:
+            return []
+        resume_vector[hits] = 1.0
+        scores = matrix @ resume_vector
+        order = np.argsort(-scores, kind='stable')
+        if top is not None:
+            order = order[:top]
+        return [(keys[i], float(scores[i])) for i in order]
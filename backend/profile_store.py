@@ -0,0 +1,196 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from types import MappingProxyType
+
+from keyword_matcher import normalize_term
+
+
+class ProfileStore:
+    """Job profiles published as copy-on-write snapshots.
+
+    Readers get an immutable mapping and never take a lock; writers build a new dict and
+    swap it in. Custom profiles, and every generated profile keyed by normalized role
+    name, are persisted in SQLite when a path is given and read on first use. Concurrent
+    generations for the same role share a single in-flight call.
+    """
+
+    def __init__(self, defaults, path=None):
+        self.path = path
+        self._defaults = frozenset(defaults)
+        self._snapshot = MappingProxyType(dict(defaults))
+        self._generated = {}
+        self._in_flight = {}
+        self._listeners = []
+        self._conn = None
+        self._loaded = not path
+        self._write_lock = threading.Lock()
+        self._load_lock = threading.Lock()
+        self._stats = {"generated": 0, "coalesced": 0, "cache_hits": 0}
+
+    def subscribe(self, listener):
+        """listener(key, profile) runs after every change; profile is None when removed"""
+        self._listeners.append(listener)
+
+    def load(self):
+        """Read persisted profiles once; called lazily, or from a background thread at startup"""
+        with self._load_lock:
+            if self._loaded:
+                return
+            custom, generated = {}, {}
+            try:
+                conn = sqlite3.connect(self.path, check_same_thread=False)
+                with conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS profiles (id TEXT PRIMARY KEY, profile TEXT, created_at REAL)"
+                    )
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS generated_profiles "
+                        "(role TEXT PRIMARY KEY, profile TEXT, created_at REAL)"
+                    )
+                custom = {
+                    key: json.loads(profile)
+                    for key, profile in conn.execute("SELECT id, profile FROM profiles ORDER BY created_at")
+                }
+                generated = {
+                    role: json.loads(profile)
+                    for role, profile in conn.execute("SELECT role, profile FROM generated_profiles")
+                }
+            except (sqlite3.Error, ValueError) as e:
+                print(f"Error loading job profiles, continuing without persistence: {e}")
+                conn = None
+
+            with self._write_lock:
+                self._conn = conn
+                self._generated.update(generated)
+                self._snapshot = MappingProxyType({**self._snapshot, **custom})
+                for key, profile in custom.items():
+                    self._notify(key, profile)
+                self._loaded = True
+
+    def snapshot(self):
+        """Current profiles as a read-only mapping"""
+        if not self._loaded:
+            self.load()
+        return self._snapshot
+
+    def is_default(self, key):
+        return key in self._defaults
+
+    def add(self, key, profile):
+        """Publish a new profile; returns False if the key is already taken"""
+        self.snapshot()
+        with self._write_lock:
+            if key in self._snapshot:
+                return False
+            self._snapshot = MappingProxyType({**self._snapshot, key: profile})
+            self._execute(
+                "INSERT OR REPLACE INTO profiles (id, profile, created_at) VALUES (?, ?, ?)",
+                (key, json.dumps(profile), time.time())
+            )
+            self._notify(key, profile)
+        return True
+
+    def remove(self, key):
+        self.snapshot()
+        with self._write_lock:
+            if key not in self._snapshot:
+                return False
+            profiles = dict(self._snapshot)
+            del profiles[key]
+            self._snapshot = MappingProxyType(profiles)
+            self._execute("DELETE FROM profiles WHERE id = ?", (key,))
+            self._notify(key, None)
+        return True
+
+    def generate(self, role, generate_fn):
+        """Generated fields for a role: cached, or produced by one generate_fn call shared by all waiters"""
+        role_key, cached, future, leader = self._claim(role)
+        if cached is not None:
+            return cached
+        if not leader:
+            return future.result()
+
+        try:
+            profile = generate_fn(role)
+        except Exception as e:
+            self._fail(role_key, future, e)
+            raise
+        return self._settle(role_key, future, profile)
+
+    async def generate_async(self, role, generate_fn):
+        """generate() for a coroutine generate_fn; in-flight calls are shared with threaded callers"""
+        role_key, cached, future, leader = self._claim(role)
+        if cached is not None:
+            return cached
+        if not leader:
+            return await asyncio.wrap_future(future)
+
+        try:
+            profile = await generate_fn(role)
+        except BaseException as e:
+            self._fail(role_key, future, e)
+            raise
+        return self._settle(role_key, future, profile)
+
+    def _claim(self, role):
+        """(role_key, cached profile, in-flight future, whether the caller must generate it)"""
+        self.snapshot()
+        role_key = normalize_term(role)
+        with self._write_lock:
+            cached = self._generated.get(role_key)
+            if cached is not None:
+                self._stats["cache_hits"] += 1
+                return role_key, cached, None, False
+            future = self._in_flight.get(role_key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[role_key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        return role_key, None, future, leader
+
+    def _fail(self, role_key, future, error):
+        with self._write_lock:
+            del self._in_flight[role_key]
+        future.set_exception(error)
+
+    def _settle(self, role_key, future, profile):
+        with self._write_lock:
+            del self._in_flight[role_key]
+            self._stats["generated"] += 1
+            # All-empty fields mean generation failed, so the next request tries again
+            if any(profile.values()):
+                self._generated[role_key] = profile
+                self._execute(
+                    "INSERT OR REPLACE INTO generated_profiles (role, profile, created_at) VALUES (?, ?, ?)",
+                    (role_key, json.dumps(profile), time.time())
+                )
+        future.set_result(profile)
+        return profile
+
+    def _execute(self, statement, parameters):
+        if self._conn is None:
+            return
+        try:
+            with self._conn:
+                self._conn.execute(statement, parameters)
+        except sqlite3.Error as e:
+            print(f"Error persisting job profile: {e}")
+
+    def _notify(self, key, profile):
+        # Called under the write lock so listeners see changes in order
+        for listener in self._listeners:
+            listener(key, profile)
+
+    def stats(self):
+        with self._write_lock:
+            stats = dict(self._stats)
+            stats["profiles"] = len(self._snapshot)
+            stats["cached_generations"] = len(self._generated)
+            stats["in_flight"] = len(self._in_flight)
+        stats["persistent"] = self._conn is not None
+        return stats
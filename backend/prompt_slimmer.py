@@ -0,0 +1,145 @@
+import re
+import unicodedata
+from collections import Counter
+
+from gemini_scheduler import estimate_tokens
+
+# Section headings and how much we want to keep them when the budget is tight (lower is kept first).
+# "other" is the text before the first heading, which holds the name and contact details
+SECTION_PRIORITIES = {
+    "other": 0,
+    "experience": 1,
+    "skills": 1,
+    "education": 1,
+    "summary": 2,
+    "projects": 3,
+    "certifications": 3,
+    "interests": 4,
+}
+
+SECTION_HEADINGS = {
+    "experience": ["experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"],
+    "skills": ["skills", "technical skills", "core competencies", "competencies", "technologies",
+               "tools", "key skills"],
+    "education": ["education", "academic background", "qualifications", "academics"],
+    "summary": ["summary", "profile", "professional summary", "objective", "about me", "career objective"],
+    "projects": ["projects", "personal projects", "key projects"],
+    "certifications": ["certifications", "certificates", "licenses", "awards", "achievements", "publications"],
+    "interests": ["interests", "hobbies", "references", "declaration", "personal details"],
+}
+
+_HEADING_LOOKUP = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+_INLINE_WHITESPACE = re.compile(r'[ \t\v\u00a0\u2000-\u200b]+')
+_PAGE_NUMBER = re.compile(r'^(page\s*)?\d{1,3}(\s*(of|/)\s*\d{1,3})?$', re.IGNORECASE)
+_HEADING_CLEANUP = re.compile(r'[^a-z ]+')
+
+# Short lines repeated on the first/last lines of at least half the pages are headers/footers;
+# without page breaks, a short line seen this many times is treated the same way
+PAGE_EDGE_LINES = 3
+REPEATED_LINE_THRESHOLD = 4
+REPEATED_LINE_MAX_LENGTH = 80
+
+
+def normalize_text(text):
+    """NFKC-normalize, collapse inline whitespace and runs of blank lines"""
+    text = unicodedata.normalize('NFKC', text).replace('\r\n', '\n').replace('\r', '\n')
+    lines = [_INLINE_WHITESPACE.sub(' ', line).strip() for line in text.split('\n')]
+    normalized = []
+    for line in lines:
+        if not line and (not normalized or not normalized[-1]):
+            continue
+        normalized.append(line)
+    return normalized
+
+
+def _section_for_heading(line):
+    if len(line) > 40:
+        return None
+    return _HEADING_LOOKUP.get(_HEADING_CLEANUP.sub('', line.lower()).strip())
+
+
+def _header_footer_lines(pages):
+    """Lines that repeat at the top or bottom of many pages (or anywhere, for unpaginated text)"""
+    if len(pages) > 1:
+        counts = Counter()
+        for page in pages:
+            content = [line for line in page if line and not _PAGE_NUMBER.match(line)]
+            counts.update(set(content[:PAGE_EDGE_LINES] + content[-PAGE_EDGE_LINES:]))
+        threshold = max(2, len(pages) // 2)
+    else:
+        counts = Counter(line for line in pages[0] if line)
+        threshold = REPEATED_LINE_THRESHOLD
+    return {
+        line for line, count in counts.items()
+        if count >= threshold and len(line) <= REPEATED_LINE_MAX_LENGTH and not _section_for_heading(line)
+    }
+
+
+def slim_resume_text(text, token_budget=None):
+    """Strip boilerplate from extracted resume text and fit it into a token budget.
+
+    Pages may be separated by form feeds. Returns the slimmed text and a stats dict
+    with the tokens saved.
+    """
+    original_tokens = estimate_tokens(text)
+    pages = [normalize_text(page) for page in text.split('\f')]
+    header_footer = _header_footer_lines(pages)
+
+    seen = set()
+    removed_lines = 0
+    sections = [["other", []]]
+    for line in (line for page in pages for line in page):
+        if _PAGE_NUMBER.match(line):
+            removed_lines += 1
+            continue
+        if line and ((line in header_footer and line in seen) or sections[-1][1][-1:] == [line]):
+            removed_lines += 1
+            continue
+        if line:
+            seen.add(line)
+
+        section = _section_for_heading(line) if line else None
+        if section:
+            sections.append([section, []])
+        sections[-1][1].append(line)
+
+    sections = [(name, '\n'.join(body).strip()) for name, body in sections]
+    sections = [(name, body) for name, body in sections if body]
+
+    truncated_sections = []
+    if token_budget and estimate_tokens('\n\n'.join(body for _, body in sections)) > token_budget:
+        # Budget in characters (about four per token), charging each kept section for its separator
+        remaining = token_budget * 4
+        kept = {}
+        # Within a priority, smaller sections go first so they are kept whole before a large one is clipped
+        order = sorted(range(len(sections)), key=lambda i: (
+            SECTION_PRIORITIES.get(sections[i][0], 3), len(sections[i][1])
+        ))
+        for index in order:
+            name, body = sections[index]
+            if len(body) + 2 <= remaining:
+                kept[index] = body
+                remaining -= len(body) + 2
+            elif remaining > 2:
+                # Keep whole lines up to the remaining budget
+                clipped = body[:remaining - 2].rsplit('\n', 1)[0]
+                if clipped:
+                    kept[index] = clipped
+                    remaining -= len(clipped) + 2
+                truncated_sections.append(name)
+            else:
+                truncated_sections.append(name)
+        sections = [(sections[i][0], kept[i]) for i in sorted(kept)]
+
+    slim_text = '\n\n'.join(body for _, body in sections)
+    slim_tokens = estimate_tokens(slim_text) if slim_text else 0
+    return slim_text, {
+        "original_tokens": original_tokens,
+        "slim_tokens": slim_tokens,
+        "tokens_saved": max(0, original_tokens - slim_tokens),
+        "removed_lines": removed_lines,
+        "truncated_sections": truncated_sections
+    }
@@ -0,0 +1,125 @@
+import re
+from dataclasses import asdict, dataclass, field
+
+# Response schemas for Gemini structured output (the OpenAPI subset the API accepts)
+_STRING_LIST = {"type": "array", "items": {"type": "string"}}
+
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "contact_info": {
+            "type": "object",
+            "properties": {"emails": _STRING_LIST, "phones": _STRING_LIST, "linkedin": _STRING_LIST},
+            "required": ["emails", "phones", "linkedin"]
+        },
+        "skills": _STRING_LIST,
+        "experience_years": {"type": "integer"},
+        "education": _STRING_LIST,
+        "recommendations": _STRING_LIST,
+        "summary": {"type": "string"},
+        "resume_description": {"type": "string"},
+        "general_thoughts": {"type": "string"}
+    },
+    "required": [
+        "contact_info", "skills", "experience_years", "education", "recommendations",
+        "summary", "resume_description", "general_thoughts"
+    ]
+}
+
+JOB_PROFILE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "required_skills": _STRING_LIST,
+        "preferred_skills": _STRING_LIST,
+        "experience_keywords": _STRING_LIST,
+        "education_keywords": _STRING_LIST
+    },
+    "required": ["required_skills", "preferred_skills", "experience_keywords", "education_keywords"]
+}
+
+_LEADING_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+
+def _string_list(value):
+    """List of non-empty strings from a list, or from a comma-separated string"""
+    if isinstance(value, str):
+        value = value.split(',')
+    if not isinstance(value, list):
+        return []
+    return [str(item).strip() for item in value if item is not None and str(item).strip()]
+
+
+def _text(value):
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _whole_number(value):
+    """int from 5, 5.5 or "5+ years"; 0 otherwise"""
+    if isinstance(value, bool):
+        return 0
+    if isinstance(value, (int, float)):
+        return max(0, int(value))
+    match = _LEADING_NUMBER.search(value) if isinstance(value, str) else None
+    return int(float(match.group())) if match else 0
+
+
+@dataclass
+class ContactInfo:
+    emails: list = field(default_factory=list)
+    phones: list = field(default_factory=list)
+    linkedin: list = field(default_factory=list)
+
+    @classmethod
+    def from_model(cls, data):
+        data = data if isinstance(data, dict) else {}
+        return cls(_string_list(data.get("emails")), _string_list(data.get("phones")), _string_list(data.get("linkedin")))
+
+
+@dataclass
+class ResumeAnalysis:
+    """Phase-one analysis fields returned by the model, coerced to their expected types"""
+    contact_info: ContactInfo = field(default_factory=ContactInfo)
+    skills: list = field(default_factory=list)
+    experience_years: int = 0
+    education: list = field(default_factory=list)
+    recommendations: list = field(default_factory=list)
+    summary: str = ""
+    resume_description: str = ""
+    general_thoughts: str = ""
+
+    @classmethod
+    def from_model(cls, data):
+        return cls(
+            contact_info=ContactInfo.from_model(data.get("contact_info")),
+            skills=_string_list(data.get("skills")),
+            experience_years=_whole_number(data.get("experience_years")),
+            education=_string_list(data.get("education")),
+            recommendations=_string_list(data.get("recommendations")),
+            summary=_text(data.get("summary")),
+            resume_description=_text(data.get("resume_description")),
+            general_thoughts=_text(data.get("general_thoughts"))
+        )
+
+    def is_usable(self):
+        """Whether a repaired (possibly truncated) result is worth serving and caching"""
+        return bool(self.skills and (self.summary or self.resume_description or self.education))
+
+    def to_dict(self):
+        # Match scores are computed locally per job profile; these are the unscored defaults
+        return dict(asdict(self), match_score=0, match_details={})
+
+
+@dataclass
+class GeneratedProfile:
+    """Skills and keywords generated for a job role"""
+    required_skills: list = field(default_factory=list)
+    preferred_skills: list = field(default_factory=list)
+    experience_keywords: list = field(default_factory=list)
+    education_keywords: list = field(default_factory=list)
+
+    @classmethod
+    def from_model(cls, data):
+        return cls(**{name: _string_list(data.get(name)) for name in cls.__dataclass_fields__})
+
+    def to_dict(self):
+        return asdict(self)
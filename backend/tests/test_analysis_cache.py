@@ -0,0 +1,55 @@
+import os
+
+import analysis_cache
+from analysis_cache import AnalysisCache, cache_key_for_hash, make_cache_key, text_hash
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_key_depends_only_on_resume_text():
+    assert make_cache_key("resume") == make_cache_key("resume")
+    assert make_cache_key("resume") != make_cache_key("resume 2")
+    assert make_cache_key("resume") == cache_key_for_hash(text_hash("resume"))
+
+
+def test_lru_eviction_and_stats():
+    cache = AnalysisCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["entries"]) == (3, 1, 1, 2)
+
+
+def test_memory_entries_expire(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(analysis_cache.time, "time", clock)
+    cache = AnalysisCache(ttl_seconds=60)
+    cache.set("a", 1)
+    clock.now += 61
+    assert cache.get("a") is None
+
+
+def test_disk_hit_keeps_its_original_store_time(monkeypatch, tmp_path):
+    clock = Clock()
+    monkeypatch.setattr(analysis_cache.time, "time", clock)
+    AnalysisCache(ttl_seconds=60, disk_dir=str(tmp_path)).set("a", {"skills": ["python"]})
+
+    clock.now += 50
+    restarted = AnalysisCache(ttl_seconds=60, disk_dir=str(tmp_path))
+    assert restarted.get("a") == {"skills": ["python"]}
+    assert restarted.stats()["disk_hits"] == 1
+
+    # Promoted to memory, but still expires 60s after it was first stored
+    clock.now += 11
+    assert restarted.get("a") is None
+    assert os.listdir(tmp_path) == []
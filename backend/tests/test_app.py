@@ -0,0 +1,51 @@
+import io
+import json
+
+import pytest
+
+import app as service
+
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(service, "CANDIDATE_INDEX_DIR", str(tmp_path / "candidate_index"))
+    monkeypatch.setattr(service, "APP_WARM_UP", False)
+    monkeypatch.setattr(service.profile_store, "load", lambda: None)
+    return service.create_app().test_client()
+
+
+def sse_events(body):
+    events = []
+    for block in body.decode("utf-8").strip().split("\n\n"):
+        event, data = block.split("\n", 1)
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def upload(text, filename="resume.txt", **form):
+    return dict(form, resume=(io.BytesIO(text.encode("utf-8")), filename))
+
+
+def test_stream_fast_mode_sends_local_analysis(client):
+    response = client.post("/api/analyze-resume/stream", data=upload(
+        "Jane Doe jane@example.com\nPython and SQL developer", job_profile="software_engineer", mode="fast"
+    ))
+    assert response.status_code == 200
+    events = sse_events(response.data)
+    fields = {payload["field"]: payload["value"] for event, payload in events if event == "field"}
+    assert fields["contact_info"]["emails"] == ["jane@example.com"]
+    assert events[-1][0] == "result"
+    assert events[-1][1]["analysis_mode"] == "fast"
+    assert events[-1][1]["match_score"] > 0
+
+
+@pytest.mark.parametrize("filename, mode, error", [
+    ("resume.txt", "quick", "mode must be 'full' or 'fast'"),
+    ("resume.exe", "full", "File type not supported. Please upload PDF, DOC, DOCX, or TXT files"),
+    ("", "full", "No file selected"),
+])
+def test_stream_rejects_the_same_uploads_as_analyze(client, filename, mode, error):
+    for path in ("/api/analyze-resume", "/api/analyze-resume/stream"):
+        response = client.post(path, data=upload("text", filename=filename, mode=mode))
+        assert response.status_code == 400
+        assert response.get_json() == {"error": error}
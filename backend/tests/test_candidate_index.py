@@ -0,0 +1,73 @@
+import pytest
+
+from candidate_index import CandidateIndex
+
+CANDIDATES = [
+    ("a" * 64, "alice.pdf", {"skills": ["Python", "SQL"], "experience_years": 6}),
+    ("b" * 64, "bob.pdf", {"skills": ["Java"], "experience_years": 2}),
+    ("c" * 64, "carol.pdf", {"skills": ["Python"], "education": ["BSc Computer Science"], "experience_years": "4"}),
+]
+
+
+def fill(index):
+    return [index.add(text_hash, filename, analysis) for text_hash, filename, analysis in CANDIDATES]
+
+
+def filenames(index, hits):
+    return [index.get(candidate_id)["filename"] for candidate_id, _ in hits]
+
+
+@pytest.mark.parametrize("compact_every", [1000, 2])
+def test_search_by_terms_and_experience(tmp_path, compact_every):
+    index = CandidateIndex(str(tmp_path), compact_every=compact_every)
+    assert fill(index) == [0, 1, 2]
+
+    hits, total = index.search({"python": 1.0, "sql": 1.0})
+    assert filenames(index, hits) == ["alice.pdf", "carol.pdf"]
+    assert [score for _, score in hits] == [2.0, 1.0]
+    assert total == 2
+
+    hits, total = index.search({"python": 1.0}, min_years=5)
+    assert filenames(index, hits) == ["alice.pdf"] and total == 1
+
+    hits, total = index.search({}, min_years=3, k=5)
+    assert filenames(index, hits) == ["alice.pdf", "carol.pdf"] and total == 2
+
+    assert index.search({"rust": 1.0}) == ([], 0)
+    assert filenames(index, index.search({"bsc computer science": 1.0})[0]) == ["carol.pdf"]
+
+
+def test_readding_same_resume_is_a_noop(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    fill(index)
+    assert index.add("a" * 64, "alice-again.pdf", {"skills": ["Go"]}) == 0
+    assert index.stats()["candidates"] == 3
+    assert index.search({"go": 1.0}) == ([], 0)
+
+
+def test_reopened_index_matches_before_and_after_compaction(tmp_path):
+    index = CandidateIndex(str(tmp_path))
+    fill(index)
+    before = index.search({"python": 1.0, "java": 0.5})
+    index.compact()
+    assert index.stats()["pending"] == 0
+
+    reopened = CandidateIndex(str(tmp_path))
+    assert reopened.stats()["compacted"] == 3
+    assert reopened.search({"python": 1.0, "java": 0.5}) == before
+    assert reopened.get(2)["experience_years"] == 4.0
+
+
+def test_instances_sharing_a_directory_see_each_others_candidates(tmp_path):
+    first = CandidateIndex(str(tmp_path), compact_every=3)
+    second = CandidateIndex(str(tmp_path), compact_every=3)
+    first.add("a" * 64, "alice.pdf", {"skills": ["Go"]})
+    second.add("b" * 64, "bob.pdf", {"skills": ["Go"]})
+    assert first.add("b" * 64, "bob.pdf", {"skills": ["Go"]}) == 1
+    first.add("c" * 64, "carol.pdf", {"skills": ["Go"]})  # compacts
+
+    for index in (first, second):
+        hits, total = index.search({"go": 1.0})
+        assert total == 3
+        assert sorted(candidate_id for candidate_id, _ in hits) == [0, 1, 2]
+    assert second.get(2)["filename"] == "carol.pdf"
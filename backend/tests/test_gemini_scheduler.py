@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gemini_scheduler import BATCH, INTERACTIVE, GeminiScheduler
+
+
+class RateLimitError(Exception):
+    def __str__(self):
+        return "429 Resource has been exhausted (e.g. check quota)."
+
+
+class FakeModel:
+    """Fails the first `failures` calls with a 429, then answers; records when each call started"""
+
+    def __init__(self, failures=0, latency=0.0):
+        self.failures = failures
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def _call(self, prompt):
+        with self._lock:
+            self.calls.append((time.monotonic(), prompt))
+            fail = self.failures > 0
+            self.failures -= 1 if fail else 0
+        if fail:
+            raise RateLimitError()
+        return f"response to {prompt}"
+
+    def generate_content(self, prompt, stream=False, **kwargs):
+        time.sleep(self.latency)
+        response = self._call(prompt)
+        return iter([response]) if stream else response
+
+    async def generate_content_async(self, prompt, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._call(prompt)
+
+
+def test_retries_rate_limits_and_counts_them():
+    model = FakeModel(failures=2)
+    scheduler = GeminiScheduler(model, max_retries=3, base_backoff=0.01)
+    assert scheduler.generate("a") == "response to a"
+    stats = scheduler.stats()
+    assert (stats["rate_limited"], stats["retries"], stats["completed"]) == (2, 2, 1)
+
+
+def test_zero_retries_makes_one_attempt_and_raises():
+    model = FakeModel(failures=1)
+    scheduler = GeminiScheduler(model, max_retries=0, base_backoff=0.01)
+    with pytest.raises(RateLimitError):
+        scheduler.generate("a")
+    assert len(model.calls) == 1
+
+
+def test_non_rate_limit_errors_are_not_retried():
+    class Broken:
+        calls = 0
+
+        def generate_content(self, prompt, **kwargs):
+            Broken.calls += 1
+            raise ValueError("bad request")
+
+    scheduler = GeminiScheduler(Broken(), max_retries=3)
+    with pytest.raises(ValueError):
+        scheduler.generate("a")
+    assert Broken.calls == 1
+    assert scheduler.stats()["errors"] == 1
+
+
+def test_rate_limit_backoff_is_shared_by_all_callers():
+    model = FakeModel(failures=1, latency=0.02)
+    scheduler = GeminiScheduler(model, max_concurrency=4, base_backoff=0.3)
+    results = []
+    threads = [threading.Thread(target=lambda p=p: results.append(scheduler.generate(p))) for p in "abcd"]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 4
+    failed_at = model.calls[0][0]
+    # Calls already admitted may finish, but nothing new starts until the shared backoff ends
+    late_starts = [started for started, _ in model.calls[1:] if started > failed_at + 0.05]
+    assert late_starts and min(late_starts) >= failed_at + 0.25
+    assert scheduler.stats()["backoff_seconds"] >= 0.25
+
+
+def test_interactive_calls_are_admitted_before_batch():
+    model = FakeModel(latency=0.05)
+    scheduler = GeminiScheduler(model, max_concurrency=1)
+    threads = [threading.Thread(target=scheduler.generate, args=("first",))]
+    threads += [threading.Thread(target=scheduler.generate, args=(f"batch{i}", BATCH)) for i in range(2)]
+    threads += [threading.Thread(target=scheduler.generate, args=("interactive", INTERACTIVE))]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+    assert [prompt for _, prompt in model.calls] == ["first", "interactive", "batch0", "batch1"]
+
+
+def test_stream_holds_a_slot_until_exhausted():
+    scheduler = GeminiScheduler(FakeModel(), max_concurrency=1)
+    chunks = scheduler.stream("a")
+    assert next(chunks) == "response to a"
+    assert scheduler.stats()["in_flight"] == 1
+    assert list(chunks) == []
+    assert scheduler.stats()["in_flight"] == 0
+
+
+def test_async_generate_shares_limits_and_retries():
+    model = FakeModel(failures=1, latency=0.01)
+    scheduler = GeminiScheduler(model, max_concurrency=2, base_backoff=0.05)
+
+    async def run():
+        return await asyncio.gather(*(scheduler.generate_async(p) for p in "abc"))
+
+    assert sorted(asyncio.run(run())) == ["response to a", "response to b", "response to c"]
+    assert scheduler.stats()["retries"] == 1
+
+
+def test_model_factory_creates_client_on_first_call():
+    created = []
+    scheduler = GeminiScheduler(model_factory=lambda: created.append(1) or FakeModel())
+    assert created == []
+    scheduler.generate("a")
+    scheduler.generate("b")
+    assert created == [1]
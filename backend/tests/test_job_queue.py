@@ -0,0 +1,83 @@
+import socket
+import time
+
+import pytest
+
+from job_queue import InMemoryJobStore, JobQueue, QueueFullError, SQLiteJobStore
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = queue.get(job_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        time.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        return InMemoryJobStore()
+    return SQLiteJobStore(str(tmp_path / "jobs.db"))
+
+
+def test_jobs_complete_or_fail(store):
+    queue = JobQueue(store, workers=2)
+    done = queue.submit(lambda a, b: {"sum": a + b}, 1, 2, meta={"filename": "a.txt"})
+    failed = queue.submit(fail, "bad upload")
+
+    job = wait_for(queue, done)
+    assert job["result"] == {"sum": 3}
+    assert job["meta"] == {"filename": "a.txt"}
+    assert job["finished_at"] >= job["started_at"] >= job["submitted_at"]
+    assert wait_for(queue, failed)["error"] == "bad upload"
+    assert queue.get("missing") is None
+
+
+def test_full_queue_rejects_submission(store):
+    queue = JobQueue(store, workers=1, max_pending=1)
+    queue.submit(time.sleep, 0.3)
+    time.sleep(0.05)
+    queue.submit(time.sleep, 0)
+    with pytest.raises(QueueFullError):
+        queue.submit(time.sleep, 0)
+
+
+def test_finished_jobs_pruned_after_retention(store):
+    store.retention_seconds = 0
+    store.create("old", {"status": "completed", "submitted_at": 1, "finished_at": 1})
+    store.create("new", {"status": "queued", "submitted_at": time.time()})
+    assert store.get("old") is None
+    assert store.get("new")["status"] == "queued"
+
+
+def test_sqlite_store_shared_between_processes(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    accepting = JobQueue(SQLiteJobStore(path), workers=1)
+    polling = JobQueue(SQLiteJobStore(path), workers=1)
+    job_id = accepting.submit(lambda: "done")
+    wait_for(accepting, job_id)
+    assert polling.get(job_id)["result"] == "done"
+
+
+def test_jobs_of_dead_processes_marked_interrupted(tmp_path):
+    path = str(tmp_path / "jobs.db")
+    store = SQLiteJobStore(path)
+    store.create("orphan", {"status": "running", "submitted_at": time.time()})
+    store.create("live", {"status": "queued", "submitted_at": time.time()})
+    # A pid above the kernel's limit belongs to no running process
+    dead_owner = f"{socket.gethostname()}:999999999"
+    store._conn.execute("UPDATE jobs SET owner = ? WHERE id = 'orphan'", (dead_owner,))
+    store._conn.commit()
+
+    restarted = SQLiteJobStore(path)
+    orphan = restarted.get("orphan")
+    assert orphan["status"] == "failed"
+    assert orphan["error"] == "Interrupted by restart"
+    assert restarted.get("live")["status"] == "queued"
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from json_stream import TopLevelFieldParser, parse_json_lenient
+
+
+def feed_all(chunks):
+    parser = TopLevelFieldParser()
+    fields = []
+    for chunk in chunks:
+        fields.extend(parser.feed(chunk))
+    return fields, parser
+
+
+def test_parser_yields_each_field_once_complete():
+    parser = TopLevelFieldParser()
+    assert parser.feed('{"skills": ["py') == []
+    assert parser.feed('thon"], "summary": "ok"') == [("skills", ["python"])]
+    assert parser.feed('}') == [("summary", "ok")]
+    assert parser.finished
+
+
+def test_parser_ignores_code_fence_before_object():
+    fields, parser = feed_all(['```json\n{"a": 1', '}\n```'])
+    assert fields == [("a", 1)]
+    assert parser.finished
+
+
+def test_parser_braces_and_commas_inside_strings_split_across_chunks():
+    text = '{"summary": "uses {braces}, [brackets] and \\"quotes\\"}", "nested": {"x": [1, {"y": "}"}]}}'
+    for size in (1, 2, 3, 7):
+        fields, parser = feed_all([text[i:i + size] for i in range(0, len(text), size)])
+        assert dict(fields) == json.loads(text)
+        assert parser.finished
+
+
+def test_parser_escape_split_across_chunks():
+    fields, _ = feed_all(['{"a": "x\\', '"}"', ', "b": 2}'])
+    assert fields == [("a", 'x"}'), ("b", 2)]
+
+
+def test_parser_stops_after_top_level_object():
+    fields, parser = feed_all(['{"a": 1}', ' trailing {"b": 2}'])
+    assert fields == [("a", 1)]
+    assert parser.finished
+
+
+def test_lenient_parses_valid_json_unrepaired():
+    assert parse_json_lenient('Here you go:\n```json\n{"a": [1, 2]}\n```') == ({"a": [1, 2]}, False)
+
+
+def test_lenient_drops_trailing_commas():
+    value, repaired = parse_json_lenient('{"a": [1, 2,], "b": {"c": 3,},}')
+    assert value == {"a": [1, 2], "b": {"c": 3}}
+    assert repaired
+
+
+def test_lenient_cuts_truncated_string_back_to_last_member():
+    value, repaired = parse_json_lenient('{"skills": ["go", "sql"], "summary": "Senior engineer wh')
+    assert value == {"skills": ["go", "sql"]}
+    assert repaired
+
+
+def test_lenient_closes_truncated_containers():
+    value, _ = parse_json_lenient('{"skills": ["go", "sql"], "contact_info": {"emails": ["a@b.c"]')
+    assert value == {"skills": ["go", "sql"], "contact_info": {"emails": ["a@b.c"]}}
+
+
+def test_lenient_truncated_inside_nested_list_keeps_complete_items():
+    value, _ = parse_json_lenient('{"a": 1, "skills": ["go", "sq')
+    assert value == {"a": 1, "skills": ["go"]}
+
+
+def test_lenient_string_containing_closing_brace():
+    value, _ = parse_json_lenient('{"a": "x}", "b": "y},", "c": "unterminated }')
+    assert value == {"a": "x}", "b": "y},"}
+
+
+def test_lenient_raises_when_nothing_recoverable():
+    with pytest.raises(ValueError):
+        parse_json_lenient("no json here")
+    with pytest.raises(ValueError):
+        parse_json_lenient('{"summary": "cut off')
@@ -0,0 +1,67 @@
+from keyword_matcher import KeywordMatcher, resume_ngrams
+
+PROFILE = {
+    "required_skills": ["Machine Learning", "machine", "learning", "Node.js", "C++", ".NET", "R", "CI/CD"],
+    "preferred_skills": ["natural language processing toolkit", "c#"],
+    "experience_keywords": ["led"],
+    "education_keywords": ["computer science"]
+}
+
+
+def matcher():
+    return KeywordMatcher({"profile": PROFILE})
+
+
+def test_overlapping_and_nested_terms_all_match():
+    found = matcher().find_terms("Applied machine   learning\nmodels")
+    assert {"machine learning", "machine", "learning"} <= found
+
+
+def test_punctuated_terms_match_whole_tokens():
+    found = matcher().find_terms("Built .NET and Node.js services in C++ and C#, with CI/CD.")
+    assert {".net", "node.js", "c++", "c#", "ci/cd"} <= found
+
+
+def test_single_letter_term_needs_its_own_token():
+    assert "r" not in matcher().find_terms("Led R&D for a team")
+    assert "r" in matcher().find_terms("Skills: R, Python")
+
+
+def test_slash_hyphen_and_possessive_parts_match():
+    m = KeywordMatcher({"profile": {"required_skills": [
+        "python", "java", "sql", "react", "node.js", "docker", "kubernetes", "ci/cd", "sql server"
+    ]}})
+    assert m.find_terms("Languages: Python/Java/SQL") == {"python", "java", "sql"}
+    assert m.find_terms("React/Node.js, Docker/Kubernetes") == {"react", "node.js", "docker", "kubernetes"}
+    assert m.find_terms("Python's ecosystem") == {"python"}
+    assert m.find_terms("SQL-Server admin") == {"sql", "sql server"}
+    assert m.find_terms("Set up CI/CD") == {"ci/cd"}
+
+
+def test_terms_do_not_match_inside_words():
+    assert matcher().find_terms("machinery, relearning, misled") == set()
+
+
+def test_terms_longer_than_ngrams_match():
+    found = matcher().find_terms("Built a natural language processing toolkit")
+    assert "natural language processing toolkit" in found
+    assert "natural language processing toolkit" not in matcher().find_terms("natural language processing")
+
+
+def test_live_text_and_cached_ngrams_agree():
+    m = matcher()
+    text = "Led R&D on .NET/C++ and machine-learning; BSc Computer Science"
+    assert m.find_terms(text) == m.terms_in_ngrams(resume_ngrams(text))
+    score, details = m.score_ngrams(resume_ngrams(text), "profile")
+    assert (score, details) == m.score_text(text, "profile")
+    assert details["required_skills_match"] == "5/8"
+    assert details["education_keywords_match"] == "1/1"
+
+
+def test_profile_updates_change_vocabulary():
+    m = matcher()
+    m.set_profile("other", {"required_skills": ["kubernetes"]})
+    assert m.find_terms("kubernetes and c++") == {"kubernetes", "c++"}
+    m.remove_profile("other")
+    assert m.find_terms("kubernetes and c++") == {"c++"}
+    assert m.score(set(), "missing") == (0, {})
@@ -0,0 +1,50 @@
+import app as service
+from analysis_cache import AnalysisCache, cache_key_for_hash, text_hash
+from near_duplicates import NearDuplicateIndex
+
+BASE = " ".join(f"Built and maintained service {i} in Python with Docker and PostgreSQL" for i in range(40))
+
+
+def test_near_identical_text_matches_and_different_text_does_not():
+    index = NearDuplicateIndex(threshold=0.8)
+    index.add("base", index.signature(BASE))
+    assert [doc_id for doc_id, _ in index.query(index.signature(BASE + " Phone 0123"))] == ["base"]
+    assert index.query(index.signature("Marketing lead for social media campaigns " * 20)) == []
+
+
+def test_query_excludes_own_id_and_empty_text_has_no_signature():
+    index = NearDuplicateIndex()
+    index.add("base", index.signature(BASE))
+    assert index.query(index.signature(BASE), exclude="base") == []
+    assert index.signature("  ,.;  ") is None
+
+
+def test_signatures_reload_from_disk(tmp_path):
+    path = str(tmp_path / "minhash.bin")
+    index = NearDuplicateIndex(path=path)
+    index.add("base", index.signature(BASE))
+    index.add("base", index.signature(BASE))
+
+    reloaded = NearDuplicateIndex(path=path)
+    assert len(reloaded) == 1
+    assert reloaded.query(reloaded.signature(BASE))[0][0] == "base"
+
+
+def test_reuse_keeps_local_contact_info_even_when_empty(monkeypatch):
+    index = NearDuplicateIndex(threshold=0.8)
+    cache = AnalysisCache()
+    monkeypatch.setattr(service, "get_near_duplicates", lambda: index)
+    monkeypatch.setattr(service, "analysis_cache", cache)
+
+    prior_text = "jane@example.com " + BASE
+    index.add(text_hash(prior_text), index.signature(prior_text))
+    cache.set(cache_key_for_hash(text_hash(prior_text)), {
+        "skills": ["python"],
+        "contact_info": {"emails": ["jane@example.com"], "phones": [], "linkedin": []}
+    })
+
+    resume_text = BASE + " and Kubernetes"
+    extraction = service.reuse_near_duplicate(resume_text, index.signature(resume_text))
+    assert extraction["skills"] == ["python"]
+    assert extraction["contact_info"] == {"emails": [], "phones": [], "linkedin": []}
+    assert extraction["near_duplicate"]["matched_ids"] == [text_hash(prior_text)]
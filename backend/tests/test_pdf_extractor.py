@@ -0,0 +1,63 @@
+import pytest
+
+from benchmarks.resume_corpus import render_pdf
+from pdf_extractor import PdfExtractor
+
+
+def pdf(pages, words_per_page=200):
+    return render_pdf([
+        [f"Page {page + 1} line {line} " + "experience " * (words_per_page // 10) for line in range(10)]
+        for page in range(pages)
+    ])
+
+
+@pytest.fixture
+def extractor_factory():
+    extractors = []
+
+    def make(**kwargs):
+        extractor = PdfExtractor(**dict({"max_workers": 2, "time_budget": None}, **kwargs))
+        extractors.append(extractor)
+        return extractor
+
+    yield make
+    for extractor in extractors:
+        if extractor._pool is not None:
+            extractor._pool.shutdown()
+
+
+def test_short_document_is_extracted_inline_in_page_order(extractor_factory):
+    text, stats = extractor_factory(parallel_min_pages=8).extract(pdf(3))
+    pages = text.split("\f")
+    assert [page.split()[1] for page in pages] == ["1", "2", "3"]
+    assert stats["pages_extracted"] == 3
+    assert stats["parallel"] is False
+    assert stats["stopped"] is None
+
+
+def test_long_document_runs_in_parallel_with_every_page(extractor_factory):
+    text, stats = extractor_factory(chunk_pages=4, parallel_min_pages=8).extract(pdf(20))
+    assert stats["parallel"] is True
+    assert stats["pages_extracted"] == 20
+    assert [page.split()[1] for page in text.split("\f")] == [str(n) for n in range(1, 21)]
+
+
+def test_page_cap(extractor_factory):
+    _, stats = extractor_factory(max_pages=5).extract(pdf(12))
+    assert (stats["pages_total"], stats["pages_extracted"], stats["stopped"]) == (12, 5, "page_cap")
+
+
+@pytest.mark.parametrize("parallel_min_pages", [8, 1000])
+def test_token_target_stops_after_enough_text(extractor_factory, parallel_min_pages):
+    extractor = extractor_factory(token_target=100, chunk_pages=4, parallel_min_pages=parallel_min_pages)
+    _, stats = extractor.extract(pdf(20))
+    assert stats["stopped"] == "token_target"
+    assert stats["pages_extracted"] < 20
+    # Kept pages have no gaps
+    assert [timing["page"] for timing in stats["page_timings"]] == list(range(1, stats["pages_extracted"] + 1))
+
+
+@pytest.mark.parametrize("token_target", [None, 0])
+def test_no_token_target_extracts_everything(extractor_factory, token_target):
+    _, stats = extractor_factory(token_target=token_target, chunk_pages=8).extract(pdf(20))
+    assert (stats["pages_extracted"], stats["stopped"]) == (20, None)
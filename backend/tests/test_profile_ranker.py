@@ -0,0 +1,39 @@
+from profile_ranker import ProfileRanker
+
+ENGINEER = {"required_skills": ["python", "sql"], "preferred_skills": ["docker"]}
+MARKETER = {"required_skills": ["seo", "social media"]}
+ANALYST = {"required_skills": ["sql", "tableau"], "education_keywords": ["statistics"]}
+
+
+def scores(ranker, terms):
+    return {key: round(score, 6) for key, score in ranker.rank(terms)}
+
+
+def test_best_match_first_and_top_limit():
+    ranker = ProfileRanker({"engineer": ENGINEER, "marketer": MARKETER})
+    ranking = ranker.rank({"python", "sql", "docker"})
+    assert [key for key, _ in ranking] == ["engineer", "marketer"]
+    assert ranking[1][1] == 0.0
+    assert ranker.rank({"seo"}, top=1)[0][0] == "marketer"
+
+
+def test_changes_after_first_rank_match_a_fresh_build():
+    ranker = ProfileRanker({"engineer": ENGINEER, "marketer": MARKETER})
+    ranker.rank({"python"})
+    ranker.set_profile("analyst", ANALYST)
+    ranker.set_profile("engineer", dict(ENGINEER, preferred_skills=["kubernetes"]))
+    ranker.remove_profile("marketer")
+    ranker.remove_profile("missing")
+
+    fresh = ProfileRanker({"engineer": dict(ENGINEER, preferred_skills=["kubernetes"]), "analyst": ANALYST})
+    terms = {"python", "sql", "tableau", "kubernetes", "statistics"}
+    assert [key for key, _ in ranker.rank(terms)] == ["engineer", "analyst"]
+    assert scores(ranker, terms) == scores(fresh, terms)
+
+
+def test_removing_before_first_rank_and_empty_ranker():
+    ranker = ProfileRanker({"engineer": ENGINEER})
+    ranker.remove_profile("engineer")
+    assert ranker.rank({"python"}) == []
+    ranker.set_profile("marketer", MARKETER)
+    assert [key for key, _ in ranker.rank({"seo"})] == ["marketer"]
@@ -0,0 +1,101 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from profile_store import ProfileStore
+
+DEFAULTS = {"software_engineer": {"name": "Software Engineer", "required_skills": ["python"]}}
+FIELDS = {"required_skills": ["rust"], "preferred_skills": []}
+
+
+def test_snapshot_is_read_only_and_replaced_on_write():
+    store = ProfileStore(DEFAULTS)
+    before = store.snapshot()
+    assert store.add("rust_dev", {"name": "Rust Dev"})
+    assert not store.add("rust_dev", {"name": "Other"})
+    assert "rust_dev" not in before
+    assert store.snapshot()["rust_dev"] == {"name": "Rust Dev"}
+    with pytest.raises(TypeError):
+        store.snapshot()["x"] = {}
+
+
+def test_listeners_see_adds_and_removes():
+    store = ProfileStore(DEFAULTS)
+    changes = []
+    store.subscribe(lambda key, profile: changes.append((key, profile)))
+    store.add("rust_dev", {"name": "Rust Dev"})
+    assert store.remove("rust_dev")
+    assert not store.remove("rust_dev")
+    assert changes == [("rust_dev", {"name": "Rust Dev"}), ("rust_dev", None)]
+    assert store.is_default("software_engineer") and not store.is_default("rust_dev")
+
+
+def test_profiles_and_generations_persist(tmp_path):
+    path = str(tmp_path / "profiles.db")
+    store = ProfileStore(DEFAULTS, path=path)
+    store.add("rust_dev", {"name": "Rust Dev"})
+    store.generate("Rust Developer", lambda role: FIELDS)
+
+    reloaded = ProfileStore(DEFAULTS, path=path)
+    changes = []
+    reloaded.subscribe(lambda key, profile: changes.append(key))
+    assert set(reloaded.snapshot()) == {"software_engineer", "rust_dev"}
+    assert changes == ["rust_dev"]
+    assert reloaded.generate("rust developer", lambda role: pytest.fail("not cached")) == FIELDS
+    assert reloaded.stats()["persistent"]
+
+
+def test_concurrent_generations_share_one_call():
+    store = ProfileStore(DEFAULTS)
+    calls = []
+    release = threading.Event()
+
+    def generate(role):
+        calls.append(role)
+        release.wait(5)
+        return FIELDS
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(store.generate("Rust Developer", generate)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    deadline = time.time() + 5
+    while store.stats()["coalesced"] < 3 and time.time() < deadline:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["Rust Developer"]
+    assert results == [FIELDS] * 4
+    assert store.generate("Rust Developer", generate) == FIELDS
+    assert store.stats()["cache_hits"] == 1
+
+
+def test_failed_or_empty_generation_is_retried():
+    store = ProfileStore(DEFAULTS)
+
+    def fail(role):
+        raise RuntimeError("model unavailable")
+
+    with pytest.raises(RuntimeError):
+        store.generate("Rust Developer", fail)
+    assert store.generate("Rust Developer", lambda role: {"required_skills": []}) == {"required_skills": []}
+    assert store.generate("Rust Developer", lambda role: FIELDS) == FIELDS
+
+
+def test_generate_async():
+    store = ProfileStore(DEFAULTS)
+
+    async def generate(role):
+        await asyncio.sleep(0.01)
+        return FIELDS
+
+    async def run():
+        return await asyncio.gather(*(store.generate_async("Rust Developer", generate) for _ in range(3)))
+
+    assert asyncio.run(run()) == [FIELDS] * 3
+    assert store.stats()["generated"] == 1
@@ -0,0 +1,41 @@
+from prompt_slimmer import slim_resume_text
+
+
+def make_resume(experience_lines=200):
+    header = ["Jane Doe", "jane@example.com", "+44 7700 900123"]
+    experience = ["Experience"] + [f"Built service number {i} with Python and Kubernetes" for i in range(experience_lines)]
+    education = ["Education", "BSc Computer Science, University of Leeds"]
+    skills = ["Skills", "Python, SQL, Docker"]
+    interests = ["Interests", "Chess, hiking"]
+    return "\n".join(header + [""] + experience + [""] + education + [""] + skills + [""] + interests)
+
+
+def test_under_budget_keeps_everything():
+    text, stats = slim_resume_text(make_resume(experience_lines=3), token_budget=6000)
+    assert "Jane Doe" in text and "Chess, hiking" in text
+    assert stats["truncated_sections"] == []
+
+
+def test_page_numbers_and_repeated_headers_removed():
+    pages = [f"Jane Doe - CV\nLine {i} of real content\nPage {i + 1}" for i in range(4)]
+    text, stats = slim_resume_text("\f".join(pages))
+    assert text.count("Jane Doe - CV") == 1
+    assert "Page" not in text
+    assert stats["removed_lines"] == 7
+    assert stats["tokens_saved"] > 0
+
+
+def test_large_section_is_clipped_after_header_and_small_sections():
+    text, stats = slim_resume_text(make_resume(), token_budget=400)
+    assert "Jane Doe" in text and "jane@example.com" in text and "+44 7700 900123" in text
+    assert "BSc Computer Science" in text
+    assert "Python, SQL, Docker" in text
+    assert "Built service number 0 " in text
+    assert "Built service number 199" not in text
+    assert stats["truncated_sections"] == ["experience"]
+    assert stats["slim_tokens"] <= 400
+
+
+def test_sections_stay_in_document_order():
+    text, _ = slim_resume_text(make_resume(), token_budget=400)
+    assert text.index("Jane Doe") < text.index("Built service") < text.index("BSc") < text.index("Python, SQL")
@@ -5,6 +5,22 @@ import { Upload, FileText, Mail, Phone, Linkedin, Award, BookOpen, TrendingUp, A
 import { toast, ToastContainer } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
+// Shape of an analysis before any streamed fields have arrived
+const EMPTY_RESULTS = {
+  contact_info: { emails: [], phones: [], linkedin: [] },
+  skills: [],
+  experience_years: 0,
+  education: [],
+  match_score: 0,
+  match_details: {},
+  recommendations: [],
+  summary: '',
+  resume_description: '',
+  general_thoughts: '',
+  word_count: 0,
+  character_count: 0
+};
+
 function App() {
   const [file, setFile] = useState(null);
   const [jobProfile, setJobProfile] = useState('');
@@ -68,24 +84,61 @@ function App() {
     }
 
     try {
-      const response = await axios.post('http://localhost:5000/api/analyze-resume', formData, {
-        headers: {
-          'Content-Type': 'multipart/form-data',
-        },
+      const response = await fetch('http://localhost:5000/api/analyze-resume/stream', {
+        method: 'POST',
+        body: formData,
       });
-      setResults(response.data);
+      if (!response.ok) {
+        const data = await response.json().catch(() => ({}));
+        setError(data.error || 'An error occurred during analysis');
+        return;
+      }
+
+      // Server-Sent Events: render each field as soon as it arrives
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        events.forEach(handleStreamEvent);
+      }
     } catch (err) {
       console.error('Analysis error:', err);
-      if (err.code === 'ERR_NETWORK') {
+      if (err instanceof TypeError) {
         setError('Cannot connect to backend server. Please ensure the backend is running on port 5000.');
       } else {
-        setError(err.response?.data?.error || 'An error occurred during analysis');
+        setError('An error occurred during analysis');
       }
     } finally {
       setLoading(false);
     }
   };
 
+  const handleStreamEvent = (rawEvent) => {
+    const lines = rawEvent.split('\n');
+    const eventLine = lines.find((line) => line.startsWith('event: '));
+    const dataLines = lines.filter((line) => line.startsWith('data: '));
+    if (!eventLine || dataLines.length === 0) return;
+
+    const event = eventLine.slice('event: '.length);
+    const data = JSON.parse(dataLines.map((line) => line.slice('data: '.length)).join('\n'));
+    if (event === 'field') {
+      setResults((previous) => {
+        const current = previous || EMPTY_RESULTS;
+        const value = data.field === 'contact_info'
+          ? { ...EMPTY_RESULTS.contact_info, ...data.value }
+          : data.value ?? EMPTY_RESULTS[data.field];
+        return { ...current, [data.field]: value };
+      });
+    } else if (event === 'result') {
+      setResults(data);
+    }
+  };
+
   const getScoreColor = (score) => {
     if (score >= 70) return 'score-excellent';
     if (score >= 50) return 'score-good';